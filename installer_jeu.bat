@@ -103,16 +103,16 @@ if errorlevel 1 (
 )
 set "PY_READY=1"
 
-echo Mise a jour de pip et installation de pygame...
+echo Mise a jour de pip et installation de pygame et numpy...
 py -m ensurepip --upgrade >nul 2>&1
 py -m pip install --upgrade pip
 if errorlevel 1 (
     echo Echec de la mise a jour de pip.
     goto :END
 )
-py -m pip install --upgrade pygame
+py -m pip install --upgrade pygame numpy
 if errorlevel 1 (
-    echo Echec de l'installation de pygame. Relancez la commande manuellement si besoin.
+    echo Echec de l'installation de pygame ou numpy. Relancez la commande manuellement si besoin.
     goto :END
 )
 
@@ -140,6 +140,66 @@ def load_tutorial_image():
 tutorial_texts = load_tutorial_texts()
 tutorial_image = load_tutorial_image()
 
+# === Gestionnaire de ressources (sprites) ===
+# Toutes les images sont chargées, converties et mises à l'échelle une seule fois
+# au démarrage; la boucle de jeu ne fait plus que demander une surface par nom.
+ASSET_DIRS = [os.path.dirname(__file__), os.path.join(os.path.dirname(__file__), "tutoriel")]
+SPRITE_FILES = {
+    "perso": "perso.png",
+    "perso2": "perso2.png",
+    "perso3": "perso3.png",
+    "perso4": "perso4.png",
+    "monster": "monster.png",
+}
+SPRITE_SCALE = 2
+sprites = {}
+flipped_sprites = {}
+
+def _find_asset(filename):
+    for folder in ASSET_DIRS:
+        path = os.path.join(folder, filename)
+        if os.path.isfile(path):
+            return path
+    return None
+
+def _placeholder_sprite(size=(16, 32)):
+    placeholder = pygame.Surface(size, pygame.SRCALPHA)
+    placeholder.fill((255, 0, 255, 255))
+    pygame.draw.rect(placeholder, (0, 0, 0, 255), placeholder.get_rect(), 1)
+    return placeholder
+
+def load_sprites():
+    sprites.clear()
+    flipped_sprites.clear()
+    for name, filename in SPRITE_FILES.items():
+        image = None
+        path = _find_asset(filename)
+        if path:
+            try:
+                image = pygame.image.load(path).convert_alpha()
+            except (pygame.error, OSError) as e:
+                print(f"Impossible de charger l'image : {e}")
+        else:
+            print(f"Impossible de charger l'image : {filename} introuvable")
+        if image is None:
+            image = _placeholder_sprite()
+        sprites[name] = pygame.transform.scale(image, (image.get_width()*SPRITE_SCALE, image.get_height()*SPRITE_SCALE))
+
+def get_sprite(name, flipped=False):
+    sprite = sprites.get(name)
+    if sprite is None:
+        sprite = pygame.transform.scale(_placeholder_sprite(), (16*SPRITE_SCALE, 32*SPRITE_SCALE))
+        sprites[name] = sprite
+    if not flipped:
+        return sprite
+    mirrored = flipped_sprites.get(name)
+    if mirrored is None:
+        mirrored = pygame.transform.flip(sprite, True, False)
+        flipped_sprites[name] = mirrored
+    return mirrored
+
+load_sprites()
+
 
 def select_tutorial_for_level(level):
     global current_tutorial_texts, tutorial_visible, tutorial_index
@@ -399,6 +459,36 @@ dash_direction = 1
 player_pos.y = GROUND_Y - (head_radius + body_height + leg_height)
 spawn_point = player_pos
 
+# === Animations du joueur (basées sur le temps) ===
+# Chaque clip est une liste de (sprite, durée en secondes). L'avancement dépend
+# de dt et non du nombre d'images affichées: la vitesse reste la même à 30,
+# 60 FPS ou sans limite.
+PLAYER_CLIPS = {
+    "idle": [("perso", 0.5)],
+    "walk": [("perso", 0.1), ("perso2", 0.1), ("perso4", 0.1), ("perso3", 0.1)],
+    "jump": [("perso4", 0.2)],
+    "dash": [("perso3", 0.05), ("perso4", 0.05)],
+}
+player_anim = {"clip": "idle", "frame": 0, "time": 0.0}
+
+def set_player_clip(name):
+    if player_anim["clip"] != name:
+        player_anim["clip"] = name
+        player_anim["frame"] = 0
+        player_anim["time"] = 0.0
+
+def update_player_animation(dt):
+    frames = PLAYER_CLIPS[player_anim["clip"]]
+    player_anim["time"] += dt
+    duration = frames[player_anim["frame"]][1]
+    while duration > 0 and player_anim["time"] >= duration:
+        player_anim["time"] -= duration
+        player_anim["frame"] = (player_anim["frame"] + 1) % len(frames)
+        duration = frames[player_anim["frame"]][1]
+
+def current_player_sprite():
+    return PLAYER_CLIPS[player_anim["clip"]][player_anim["frame"]][0]
+
 # === Projectiles ===
 projectiles = []
 projectile_radius = 6
@@ -619,10 +709,8 @@ fword_timer = 0.0
 # === Boucle principale ===
 running = True
 dt = 0
-cnt = 0
 
 while running:
-    cnt = (cnt+1)%4
     # Boutons du menu (recalculés à chaque frame pour simplicité)
     play_rect = pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 + 40, 300, 70)
     quit_rect = pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 + 130, 300, 70)
@@ -949,6 +1037,17 @@ while running:
     if shoot_recoil > 0:
         shoot_recoil -= dt
 
+    # Animation: dash > saut > marche > repos
+    if dash_timer > 0:
+        set_player_clip("dash")
+    elif not on_ground:
+        set_player_clip("jump")
+    elif moving:
+        set_player_clip("walk")
+    else:
+        set_player_clip("idle")
+    update_player_animation(dt)
+
     if player_pos.y > DEATH_BELOW_Y:
         lives -= 1
         is_invulnerable = True
@@ -1140,29 +1239,13 @@ while running:
     render_center = (p_center_screen[0], p_center_screen[1] + int(bob))
 
     if not is_invulnerable or int(invuln_timer * 10) % 2 == 0:
-        if moving:
-            movement = ''
-            if cnt == 0:
-                movement = 'perso.png'
-            elif cnt == 1:
-                movement = 'perso2.png'
-            elif cnt == 2:
-                movement = 'perso4.png'
-            elif cnt == 3:
-                movement = 'perso3.png'
-        else:
-            movement = 'perso.png'
-        # Chargement de l'image
-        try:
-            image = pygame.image.load(movement).convert_alpha()
-        except pygame.error as e:
-            print(f"Impossible de charger l'image : {e}")
-            pygame.quit()
+        # Image du clip en cours, déjà chargée et mise à l'échelle (regarde à droite par défaut)
+        image = get_sprite(current_player_sprite(), flipped=direction < 0)
 
         # Définir les coordonnées de départ pour l'image
         # Nous centrons l'image ici à titre d'exemple
-        image_rect = pygame.Rect(p_center_screen[0]+image.get_width(), p_center_screen[1]+image.get_height(), 40, 40)
-        image = pygame.transform.scale(image, (image.get_width()*2, image.get_height()*2))
+        image_rect = pygame.Rect(p_center_screen[0]+image.get_width()//SPRITE_SCALE,
+                                 p_center_screen[1]+image.get_height()//SPRITE_SCALE, 40, 40)
 
         # Dessiner l'image
         screen.blit(image, image_rect)
@@ -1207,14 +1290,11 @@ while running:
             # Traînée légère
             pygame.draw.circle(screen, (255, 200, 120), (monster_screen[0] - monster["dir"]*r, monster_screen[1]), max(1, r//4))
         else:  # flyer
-            try:
-                image = pygame.image.load('monster.png').convert_alpha()
-            except pygame.error as e:
-                print(f"Impossible de charger l'image : {e}")
-                pygame.quit()
+            # Image partagée (regarde à gauche par défaut)
+            image = get_sprite('monster', flipped=monster["dir"] > 0)
 
-            image_rect = pygame.Rect(monster_screen[0]-image.get_width(), monster_screen[1]-image.get_height(), 40, 40)
-            image = pygame.transform.scale(image, (image.get_width()*2, image.get_height()*2))
+            image_rect = pygame.Rect(monster_screen[0]-image.get_width()//SPRITE_SCALE,
+                                     monster_screen[1]-image.get_height()//SPRITE_SCALE, 40, 40)
 
             # Dessiner l'image
             screen.blit(image, image_rect)
@@ -0,0 +1,931 @@
+# === Moteur du jeu (simulation sans affichage) ===
+# Tout l'état de jeu (joueur, monstres, projectiles, particules, niveau, score)
+# vit dans un World qui avance par world.step(inputs, dt). Aucun appel à
+# pygame.display ni aux polices: on peut simuler des milliers de pas par
+# seconde (tests, bots, mesures) et faire tourner plusieurs mondes à la fois.
+# play.py ne fait que lire le World pour le dessiner.
+import pygame
+import numpy as np
+import random
+import math
+import json
+import os
+from collections import namedtuple
+
+# === Constantes ===
+GROUND_Y = 680
+GROUND_START_X = 0
+GROUND_END_X = 3000
+
+GRAVITY = 800
+JUMP_FORCE = -600
+MOVE_SPEED = 300
+PROJECTILE_SPEED = 800
+STAMINA_MAX = 100
+STAMINA_JUMP_COST = 10
+STAMINA_REGEN_DELAY = 4.0
+STAMINA_REGEN_INTERVAL = 0.5
+STAMINA_REGEN_AMOUNT = 5
+DOUBLE_JUMP_COST = 15
+DASH_COST = 10
+DASH_SPEED = 900
+DASH_DURATION = 0.2
+MAX_MONSTERS = 3
+MONSTER_SPAWN_COOLDOWN = 2.0  # Secondes entre chaque spawn
+DEATH_BELOW_Y = GROUND_Y + 1500
+LEVEL_TRANSITION_FADE_OUT = 0.6
+LEVEL_TRANSITION_FADE_IN = 0.6
+
+head_radius = 20
+body_height = 40
+leg_height = 30
+projectile_radius = 6
+invuln_time = 1.5
+
+# Taille de la vue par défaut (caméra et disparition des projectiles hors champ)
+DEFAULT_VIEW_SIZE = (1366, 769)
+
+# === Pas fixe ===
+# La logique avance par pas de FIXED_DT (SIM_HZ par seconde), quel que soit le
+# FPS d'affichage: un à-coup ne fait plus traverser les plateformes et le jeu
+# se comporte pareil sur toutes les machines.
+SIM_HZ = 120
+FIXED_DT = 1.0 / SIM_HZ
+CAMERA_LAG = 0.05
+# CAMERA_LAG était appliqué par image à 60 FPS: même amortissement par pas
+CAMERA_LAG_STEP = 1 - (1 - CAMERA_LAG) ** (FIXED_DT * 60)
+
+# === Aléatoire ===
+# Deux flux par monde, dérivés de la même graine: "rng" pour ce qui change la
+# partie (apparition des monstres) et "fx_rng" pour le cosmétique (clignement
+# des yeux; les particules ont leur propre générateur NumPy, semé pareil).
+# Ajouter un effet visuel ne décale donc jamais les tirages du gameplay: avec
+# le pas fixe, une graine + les mêmes entrées redonnent exactement la même
+# partie.
+def new_seed():
+    return random.randrange(2**32)
+
+# Entrées d'un pas: touches tenues + tirs (cibles en coordonnées monde)
+Inputs = namedtuple("Inputs", ["left", "right", "jump", "dash", "shots"], defaults=(False, False, False, False, ()))
+
+def circle_rect_collision(center, radius, rect):
+    cx, cy = center
+    closest_x = max(rect.left, min(cx, rect.right))
+    closest_y = max(rect.top, min(cy, rect.bottom))
+    dx = cx - closest_x
+    dy = cy - closest_y
+    return dx * dx + dy * dy <= radius * radius
+
+# === Projectiles ===
+# Pool à capacité fixe en structure de tableaux (positions, vitesses, vivants):
+# les projectiles vivants occupent toujours les `count` premières cases, dans
+# l'ordre de tir. Tirer écrit dans la case suivante (aucune allocation),
+# déplacement, sortie d'écran et compactage sont vectorisés.
+PROJECTILE_POOL_CAPACITY = 1024
+
+class ProjectilePool:
+    """Projectiles du monde, stockés dans des tableaux NumPy."""
+
+    def __init__(self, capacity=PROJECTILE_POOL_CAPACITY):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._step = np.zeros((capacity, 2))
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, x, y, vel_x, vel_y):
+        # Pool plein: le tir est ignoré plutôt que de réallouer
+        if self.count >= self.capacity:
+            return False
+        idx = self.count
+        self.pos[idx] = (x, y)
+        self.prev_pos[idx] = (x, y)
+        self.vel[idx] = (vel_x, vel_y)
+        self.alive[idx] = True
+        self.count += 1
+        return True
+
+    def save_prev(self):
+        self.prev_pos[:self.count] = self.pos[:self.count]
+
+    def integrate(self, dt):
+        n = self.count
+        np.multiply(self.vel[:n], dt, out=self._step[:n])
+        self.pos[:n] += self._step[:n]
+
+    def cull(self, left, top, right, bottom):
+        # Marque comme morts les projectiles sortis de la zone
+        n = self.count
+        x = self.pos[:n, 0]
+        y = self.pos[:n, 1]
+        self.alive[:n] &= (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+
+    def compact(self):
+        # Retire les morts en gardant l'ordre de tir des vivants
+        n = self.count
+        keep = np.flatnonzero(self.alive[:n])
+        k = len(keep)
+        if k == n:
+            return
+        self.pos[:k] = self.pos[keep]
+        self.prev_pos[:k] = self.prev_pos[keep]
+        self.vel[:k] = self.vel[keep]
+        self.alive[:k] = True
+        self.count = k
+
+    def positions(self):
+        return self.pos[:self.count]
+
+# === Particules ===
+# Système à capacité fixe (le budget d'effets) en tableaux NumPy. Une gerbe
+# s'émet en quelques opérations vectorisées; si le budget est plein, les
+# nouvelles particules remplacent les cases suivantes d'un curseur circulaire
+# au lieu d'agrandir les tableaux, donc une grosse explosion ne peut pas
+# faire ramer une image. Les mortes sont retirées par échange avec la fin.
+PARTICLE_BUDGET = 2048
+
+class ParticleSystem:
+    """Particules cosmétiques du monde, stockées dans des tableaux NumPy."""
+
+    def __init__(self, budget=PARTICLE_BUDGET):
+        self.capacity = budget
+        self.pos = np.zeros((budget, 2))
+        self.vel = np.zeros((budget, 2))
+        self.life = np.zeros(budget)
+        self.color_id = np.zeros(budget, dtype=np.int16)
+        self.palette = []  # couleurs (r, g, b) indexées par color_id
+        self._palette_ids = {}
+        self.count = 0
+        self.ring_cursor = 0
+        self.rng = np.random.default_rng()
+
+    def __len__(self):
+        return self.count
+
+    def seed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    def clear(self):
+        self.count = 0
+        self.ring_cursor = 0
+
+    def emit(self, x, y, color, count=8):
+        """Crée une gerbe de particules d'explosion"""
+        count = min(count, self.capacity)
+        if count <= 0:
+            return
+        color_id = self._palette_ids.get(color)
+        if color_id is None:
+            color_id = self._palette_ids[color] = len(self.palette)
+            self.palette.append(color)
+        n = self.count
+        free = self.capacity - n
+        if count <= free:
+            slots = slice(n, n + count)
+            self.count = n + count
+        else:
+            # Budget plein: on recycle des cases à partir du curseur circulaire
+            overflow = count - free
+            recycled = (self.ring_cursor + np.arange(overflow)) % n
+            self.ring_cursor = (self.ring_cursor + overflow) % n
+            slots = np.concatenate((np.arange(n, self.capacity), recycled))
+            self.count = self.capacity
+        angle = self.rng.uniform(0, 2 * math.pi, count)
+        speed = self.rng.uniform(50, 150, count)
+        self.pos[slots] = (x, y)
+        self.vel[slots, 0] = np.cos(angle) * speed
+        self.vel[slots, 1] = np.sin(angle) * speed
+        self.life[slots] = 1.0
+        self.color_id[slots] = color_id
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.vel[:n, 1] += GRAVITY * 0.5 * dt
+        self.life[:n] -= dt * 2
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if not len(dead):
+            return
+        # Retrait par échange: les vivantes de la fin comblent les trous
+        keep = n - len(dead)
+        holes = dead[dead < keep]
+        movers = keep + np.flatnonzero(self.life[keep:n] > 0)
+        self.pos[holes] = self.pos[movers]
+        self.vel[holes] = self.vel[movers]
+        self.life[holes] = self.life[movers]
+        self.color_id[holes] = self.color_id[movers]
+        self.count = keep
+        self.ring_cursor %= max(1, keep)
+
+# === Ennemis ===
+MONSTER_TYPE_DEFAULTS = {
+    "tank": {"radius": 32, "speed": 60, "hp": 3, "dir": 1},
+    "fast": {"radius": 18, "speed": 140, "hp": 1, "dir": 1},
+    "flyer": {"radius": 22, "speed": 110, "hp": 1, "dir": 1},
+    "basic": {"radius": 20, "speed": 100, "hp": 1, "dir": 1},
+}
+
+def _canonical_monster_type(raw_type):
+    if not raw_type:
+        return "basic"
+    t = str(raw_type).lower()
+    if t in MONSTER_TYPE_DEFAULTS:
+        return t
+    if t in ("walker", "ground"):
+        return "basic"
+    return "basic"
+
+
+# Paramètres d'un ennemi de niveau, résolus une fois au chargement du niveau
+MonsterSpec = namedtuple("MonsterSpec", ["type", "x", "y", "radius", "speed", "hp", "dir",
+                                         "fly_phase", "base_y", "vel_y"])
+
+def resolve_monster_config(config):
+    m_type = _canonical_monster_type(config.get("type"))
+    defaults = MONSTER_TYPE_DEFAULTS[m_type]
+
+    x = float(config.get("x", 0))
+    y = float(config.get("y", 0))
+    width = config.get("w") or config.get("width")
+    height = config.get("h") or config.get("height")
+
+    radius = config.get("radius")
+    if radius is None:
+        if width and height:
+            radius = max(width, height) / 2
+        else:
+            radius = defaults["radius"]
+
+    speed = config.get("speed", defaults["speed"])
+    hp = int(config.get("hp", defaults["hp"]))
+    dir_val = config.get("dir", defaults["dir"])
+    direction = -1 if float(dir_val) < 0 else 1
+
+    return MonsterSpec(m_type, x, y, radius, speed, hp, direction,
+                       float(config.get("fly_phase", 0.0)), float(config.get("base_y", y)),
+                       float(config.get("vel_y", 0.0)))
+
+
+class Monster:
+    """Ennemi du monde; les instances sont recyclées par MonsterPool."""
+    __slots__ = ("pos", "prev_pos", "dir", "type", "flyer", "radius", "speed", "hp",
+                 "hit_flash", "vel_y", "fly_phase", "base_y", "template_id")
+
+    def __init__(self):
+        self.pos = pygame.Vector2()
+        self.prev_pos = pygame.Vector2()
+        self.reset("basic", 0.0, 0.0, 1, 0, 0, 0)
+
+    def reset(self, m_type, x, y, direction, radius, speed, hp,
+              vel_y=0.0, fly_phase=0.0, base_y=0.0, template_id=None):
+        self.pos.update(x, y)
+        self.prev_pos.update(x, y)
+        self.dir = direction
+        self.type = m_type
+        self.flyer = m_type == "flyer"
+        self.radius = radius
+        self.speed = speed
+        self.hp = hp
+        self.hit_flash = 0.0
+        self.vel_y = vel_y
+        self.fly_phase = fly_phase
+        self.base_y = base_y
+        self.template_id = template_id
+        return self
+
+
+class MonsterPool:
+    """Liste libre de Monster: un ennemi tué sert au prochain spawn."""
+
+    def __init__(self):
+        self.free = []
+
+    def acquire(self):
+        return self.free.pop() if self.free else Monster()
+
+    def release(self, monster):
+        self.free.append(monster)
+
+    def from_spec(self, spec, template_id=None):
+        monster = self.acquire()
+        if spec.type == "flyer":
+            return monster.reset(spec.type, spec.x, spec.y, spec.dir, spec.radius, spec.speed, spec.hp,
+                                 fly_phase=spec.fly_phase, base_y=spec.base_y, template_id=template_id)
+        return monster.reset(spec.type, spec.x, spec.y, spec.dir, spec.radius, spec.speed, spec.hp,
+                             vel_y=spec.vel_y, template_id=template_id)
+
+# === Multi-niveaux: chargement levels.json ===
+def _default_level():
+    return {
+        "name": "Niveau 1",
+        "ground": {"y": 0, "start_x": 0, "end_x": 10000},
+        "spawn": {"x": 40, "y": -40},
+        "goal": {"x": 1000, "y": -110, "w": 70, "h": 110},
+        "platforms": [],
+    }
+
+def load_levels(levels_dir=None):
+    if levels_dir is None:
+        levels_dir = os.path.dirname(os.path.abspath(__file__))
+    level_filenames = ["level.json", "levels.json"]  # support ancien et nouveau nommage
+    for name in level_filenames:
+        level_path = os.path.join(levels_dir, name)
+        if not os.path.isfile(level_path):
+            continue
+        try:
+            with open(level_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                if isinstance(data, dict) and isinstance(data.get("levels"), list) and data["levels"]:
+                    return data["levels"]
+        except Exception:
+            continue
+    return [_default_level()]
+
+# === Index spatial des plateformes ===
+# Grille uniforme construite au chargement du niveau: chaque plateforme est
+# rangée dans les cases qu'elle touche. Une requête ne parcourt que les cases
+# de la zone demandée au lieu de toutes les plateformes, pour chaque entité et
+# à chaque pas. Les cases font la largeur médiane des plateformes du niveau.
+PLATFORM_GRID_MIN_CELL = 64
+PLATFORM_GRID_MAX_CELL = 512
+
+def platform_grid_cell_size(platforms):
+    if not platforms:
+        return PLATFORM_GRID_MAX_CELL
+    widths = sorted(plat.width for plat in platforms)
+    return max(PLATFORM_GRID_MIN_CELL, min(PLATFORM_GRID_MAX_CELL, widths[len(widths) // 2]))
+
+def build_platform_grid(platforms, cell):
+    # Indices rangés dans l'ordre du niveau (les tests s'arrêtent au premier trouvé)
+    grid = {}
+    for idx, plat in enumerate(platforms):
+        for cell_y in range(plat.top // cell, plat.bottom // cell + 1):
+            for cell_x in range(plat.left // cell, plat.right // cell + 1):
+                grid.setdefault((cell_x, cell_y), []).append(idx)
+    return grid
+
+# === Monde ===
+class World:
+    """Etat complet d'une partie, avancé par step(inputs, dt)."""
+
+    def __init__(self, levels=None, view_size=DEFAULT_VIEW_SIZE, seed=None, particle_budget=PARTICLE_BUDGET):
+        self.levels = levels if levels else load_levels()
+        self.view_width, self.view_height = view_size
+        # Graine fixe (None: une nouvelle graine à chaque partie)
+        self.base_seed = seed
+        self.seed = None
+        self.rng = random.Random()
+        self.fx_rng = random.Random()
+        # Niveau courant
+        self.level_idx = 0
+        self.ground_y = GROUND_Y
+        self.ground_start_x = GROUND_START_X
+        self.ground_end_x = GROUND_END_X
+        self.platforms = []
+        self.platform_cell = PLATFORM_GRID_MAX_CELL
+        self.platform_grid = {}
+        self.goal_rect = pygame.Rect(0, 0, 0, 0)
+        self.spawn_point = pygame.Vector2(0, 0)
+        self.level_enemy_specs = []
+        # Joueur
+        self.player_pos = pygame.Vector2(self.view_width / 2, GROUND_Y - (head_radius + body_height + leg_height))
+        self.player_prev_pos = self.player_pos.copy()
+        self.player_rect = pygame.Rect(0, 0, 0, 0)
+        self.player_vel_y = 0
+        self.direction = 1
+        self.moving = False
+        self.walk_cycle = 0
+        self.on_ground = False
+        self.prev_on_ground = True
+        self.blink_timer = 0.0
+        self.blink_close = 0.0
+        self.shoot_recoil = 0.0
+        self.stamina = STAMINA_MAX
+        self.stamina_idle_timer = 0.0
+        self.stamina_regen_timer = 0.0
+        self.air_jumps_left = 1
+        self.jump_was_pressed = False
+        self.dash_was_pressed = False
+        self.dash_timer = 0.0
+        self.dash_direction = 1
+        # Caméra (celle de la simulation; l'affichage interpole entre deux pas)
+        self.camera = pygame.Vector2(0, 0)
+        self.camera_prev = pygame.Vector2(0, 0)
+        # Entités
+        self.monsters = []
+        self.monster_pool = MonsterPool()
+        self.projectiles = ProjectilePool()
+        self.particles = ParticleSystem(particle_budget)
+        self.monster_spawn_timer = 0.0
+        # Score, vies, victoire
+        self.score = 0
+        self.lives = 3
+        self.invuln_timer = 0.0
+        self.is_invulnerable = False
+        self.victory = False
+        self.level_transition_active = False
+        self.level_transition_phase = "fade_out"
+        self.level_transition_timer = 0.0
+        self.level_transition_next_idx = None
+        # Evénements pour l'affichage: ("level", idx), ("goal", idx)
+        self.events = []
+        self.start(0)
+
+    @property
+    def level(self):
+        return self.levels[self.level_idx]
+
+    @property
+    def game_over(self):
+        return self.lives <= 0
+
+    def drain_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+    # --- Niveaux ---
+    def apply_level(self, level):
+        # Sol
+        self.ground_y = int(level.get("ground", {}).get("y", self.ground_y))
+        self.ground_start_x = int(level.get("ground", {}).get("start_x", self.ground_start_x))
+        self.ground_end_x = int(level.get("ground", {}).get("end_x", self.ground_end_x))
+        # Plateformes
+        self.platforms = [
+            pygame.Rect(int(p.get("x", 0)), int(p.get("y", 0)), int(p.get("w", 0)), int(p.get("h", 0)))
+            for p in level.get("platforms", [])
+        ]
+        self.platform_cell = platform_grid_cell_size(self.platforms)
+        self.platform_grid = build_platform_grid(self.platforms, self.platform_cell)
+        # Porte/objectif
+        g = level.get("goal", {})
+        self.goal_rect.x = int(g.get("x", 2300))
+        self.goal_rect.y = int(g.get("y", -30))
+        self.goal_rect.w = int(g.get("w", 70))
+        self.goal_rect.h = int(g.get("h", 110))
+        # Spawn
+        s = level.get("spawn", {})
+        self.spawn_point.update(float(s.get("x", self.view_width / 2)),
+                                float(s.get("y", self.ground_y - (head_radius + body_height + leg_height))))
+        # Ennemis (paramètres résolus une fois ici, pas à chaque spawn)
+        self.level_enemy_specs = []
+        raw_enemies = level.get("enemies", [])
+        if isinstance(raw_enemies, list):
+            for entry in raw_enemies:
+                if isinstance(entry, dict):
+                    self.level_enemy_specs.append(resolve_monster_config(entry))
+
+    def instantiate_level_enemies(self):
+        for monster in self.monsters:
+            self.monster_pool.release(monster)
+        if self.level_enemy_specs:
+            self.monsters = [self.monster_pool.from_spec(spec, template_id=idx)
+                             for idx, spec in enumerate(self.level_enemy_specs)]
+        else:
+            self.monsters = [self.spawn_monster() for _ in range(MAX_MONSTERS)]
+        self.monster_spawn_timer = 0.0
+
+    def load_level(self, level_idx):
+        """Charge un niveau et replace le joueur au départ."""
+        self.level_idx = level_idx
+        self.apply_level(self.levels[level_idx])
+        self.instantiate_level_enemies()
+        self.player_pos = self.spawn_point.copy()
+        self.player_prev_pos.update(self.player_pos)
+        self.player_vel_y = 0
+        self.projectiles.clear()
+        self.particles.clear()
+        self.monster_spawn_timer = 0.0
+        self.stamina = STAMINA_MAX
+        self.stamina_idle_timer = 0.0
+        self.stamina_regen_timer = 0.0
+        self.air_jumps_left = 1
+        self.jump_was_pressed = False
+        self.dash_was_pressed = False
+        self.dash_timer = 0.0
+        self.dash_direction = 1
+        self.shoot_recoil = 0.0
+        self.prev_on_ground = True
+        self.is_invulnerable = False
+        self.invuln_timer = 0.0
+        self.camera.update(self.player_pos.x - self.view_width // 2, self.player_pos.y - self.view_height // 2)
+        self.camera_prev.update(self.camera)
+        self.events.append(("level", level_idx))
+
+    def start(self, level_idx=0, seed=None):
+        """Nouvelle partie sur le niveau level_idx."""
+        if seed is None:
+            seed = self.base_seed if self.base_seed is not None else new_seed()
+        self.seed = seed
+        self.rng.seed(seed)
+        self.fx_rng.seed(f"{seed}:fx")
+        self.particles.seed([seed, 1])
+        self.blink_timer = 0.0
+        self.blink_close = 0.0
+        self.walk_cycle = 0
+        self.direction = 1
+        self.score = 0
+        self.lives = 3
+        self.victory = False
+        self.level_transition_active = False
+        self.level_transition_phase = "fade_out"
+        self.level_transition_timer = 0.0
+        self.level_transition_next_idx = None
+        self.load_level(level_idx)
+
+    def platforms_near(self, left, top, right, bottom):
+        """Plateformes (dans l'ordre du niveau) des cases touchées par la zone."""
+        cell = self.platform_cell
+        grid = self.platform_grid
+        x0, x1 = int(left // cell), int(right // cell)
+        y0, y1 = int(top // cell), int(bottom // cell)
+        if x0 == x1 and y0 == y1:
+            return [self.platforms[idx] for idx in grid.get((x0, y0), ())]
+        found = set()
+        for cell_y in range(y0, y1 + 1):
+            for cell_x in range(x0, x1 + 1):
+                indices = grid.get((cell_x, cell_y))
+                if indices:
+                    found.update(indices)
+        return [self.platforms[idx] for idx in sorted(found)]
+
+    # --- Entités ---
+    def spawn_monster(self):
+        x = self.rng.randint(100, 2500)
+        # Types: tank (gros/lent), fast (petit/rapide), flyer (vole)
+        r = self.rng.random()
+        if r < 0.3:
+            m_type = "tank"
+        elif r < 0.7:
+            m_type = "fast"
+        else:
+            m_type = "flyer"
+        params = MONSTER_TYPE_DEFAULTS[m_type]
+        radius = params["radius"]
+        fly_phase = base_y = 0.0
+        if m_type == "flyer":
+            base_y = self.rng.randint(self.ground_y - 280, self.ground_y - 140)
+            y = base_y
+            fly_phase = self.rng.uniform(0, 6.28)
+        else:
+            y = self.ground_y - radius
+        return self.monster_pool.acquire().reset(m_type, x, y, self.rng.choice([-1, 1]), radius,
+                                                 params["speed"], params["hp"],
+                                                 fly_phase=fly_phase, base_y=base_y)
+
+    def create_particles(self, pos, color, count=8):
+        self.particles.emit(pos[0], pos[1], color, count)
+
+    def shoot(self, target):
+        # Tir vers un point du monde (la souris)
+        dx = target[0] - self.player_pos.x
+        dy = target[1] - self.player_pos.y
+        distance = math.sqrt(dx**2 + dy**2)
+        if distance <= 0:
+            return
+
+        dir_x = dx / distance
+        dir_y = dy / distance
+
+        proj_x = self.player_pos.x + dir_x * (head_radius + 10)
+        proj_y = self.player_pos.y + dir_y * (head_radius + 10)
+
+        self.projectiles.spawn(proj_x, proj_y, dir_x * PROJECTILE_SPEED, dir_y * PROJECTILE_SPEED)
+        # Animation de recul et effet visuel
+        self.shoot_recoil = 0.12
+        self.create_particles((proj_x, proj_y), (255, 230, 100), 6)
+
+    def respawn_player(self, particle_color):
+        self.lives -= 1
+        self.is_invulnerable = True
+        self.invuln_timer = invuln_time
+        self.player_pos = self.spawn_point.copy()
+        self.player_vel_y = 0
+        self.create_particles(self.player_pos, particle_color, 15)
+
+    # --- Simulation ---
+    def save_interpolation_state(self):
+        self.player_prev_pos.update(self.player_pos)
+        self.camera_prev.update(self.camera)
+        for monster in self.monsters:
+            monster.prev_pos.update(monster.pos)
+        self.projectiles.save_prev()
+
+    def step(self, inputs, dt):
+        """Avance la partie de dt secondes; sans effet une fois la partie finie."""
+        if self.game_over or self.victory:
+            return
+        self.save_interpolation_state()
+        for target in inputs.shots:
+            self.shoot(target)
+        self._update_player(inputs, dt)
+        self._update_camera()
+        self._update_projectiles(dt)
+        self._update_monsters(dt)
+        self._update_particles(dt)
+        self._update_goal()
+        self._update_level_transition(dt)
+
+    def _update_player(self, inputs, dt):
+        player_height = head_radius + body_height + leg_height
+
+        # Mouvements
+        self.stamina_idle_timer += dt
+        self.moving = False
+        if inputs.left:
+            self.player_pos.x -= MOVE_SPEED * dt
+            self.direction = -1
+            self.moving = True
+        if inputs.right:
+            self.player_pos.x += MOVE_SPEED * dt
+            self.direction = 1
+            self.moving = True
+        if self.moving:
+            self.walk_cycle += 10 * dt
+        else:
+            self.walk_cycle = 0
+
+        # Détection sol/plateforme
+        feet_y = self.player_pos.y + player_height
+        on_ground = False
+        # Sol infini limité en X
+        if feet_y >= self.ground_y - 0.1 and self.ground_start_x <= self.player_pos.x <= self.ground_end_x:
+            on_ground = True
+        else:
+            px = self.player_pos.x
+            for plat in self.platforms_near(px - 5, feet_y - 6, px + 5, feet_y + 6):
+                if plat.left - 5 < self.player_pos.x < plat.right + 5 and abs(feet_y - plat.top) <= 6:
+                    on_ground = True
+                    self.player_pos.y = plat.top - player_height
+                    self.player_vel_y = 0
+                    break
+        self.on_ground = on_ground
+
+        if on_ground:
+            self.air_jumps_left = 1
+
+        if inputs.jump and not self.jump_was_pressed:
+            if on_ground and self.stamina >= STAMINA_JUMP_COST:
+                self.player_vel_y = JUMP_FORCE
+                self.stamina = max(0, self.stamina - STAMINA_JUMP_COST)
+                self.stamina_idle_timer = 0.0
+                self.stamina_regen_timer = 0.0
+                self.air_jumps_left = 1
+            elif not on_ground and self.air_jumps_left > 0 and self.stamina >= DOUBLE_JUMP_COST:
+                self.player_vel_y = JUMP_FORCE
+                self.stamina = max(0, self.stamina - DOUBLE_JUMP_COST)
+                self.stamina_idle_timer = 0.0
+                self.stamina_regen_timer = 0.0
+                self.air_jumps_left -= 1
+
+        if inputs.dash and not self.dash_was_pressed and self.dash_timer <= 0 and self.stamina >= DASH_COST:
+            if inputs.left:
+                desired_dir = -1
+            elif inputs.right:
+                desired_dir = 1
+            else:
+                desired_dir = self.direction
+            if desired_dir != 0:
+                self.dash_direction = desired_dir
+                self.dash_timer = DASH_DURATION
+                self.stamina = max(0, self.stamina - DASH_COST)
+                self.stamina_idle_timer = 0.0
+                self.stamina_regen_timer = 0.0
+
+        self.jump_was_pressed = inputs.jump
+        self.dash_was_pressed = inputs.dash
+
+        self.player_vel_y += GRAVITY * dt
+        self.player_pos.y += self.player_vel_y * dt
+
+        feet_y = self.player_pos.y + player_height
+        if feet_y > self.ground_y and self.ground_start_x <= self.player_pos.x <= self.ground_end_x:
+            self.player_pos.y = self.ground_y - player_height
+            self.player_vel_y = 0
+
+        self.player_rect = pygame.Rect(int(self.player_pos.x - head_radius), int(self.player_pos.y - head_radius),
+                                       head_radius*2, head_radius*2 + body_height + leg_height)
+        if self.player_vel_y >= 0:
+            rect = self.player_rect
+            for plat in self.platforms_near(rect.left, rect.top, rect.right, rect.bottom):
+                if rect.colliderect(plat):
+                    plat_top = plat.top
+                    if feet_y - self.player_vel_y * dt <= plat_top:
+                        self.player_pos.y = plat_top - player_height
+                        self.player_vel_y = 0
+                        break
+
+        if self.dash_timer > 0:
+            self.player_pos.x += self.dash_direction * DASH_SPEED * dt
+            self.dash_timer = max(0.0, self.dash_timer - dt)
+
+        self.player_pos.x = max(head_radius, self.player_pos.x)
+
+        if self.stamina_idle_timer >= STAMINA_REGEN_DELAY and self.stamina < STAMINA_MAX:
+            self.stamina_regen_timer += dt
+            while self.stamina_regen_timer >= STAMINA_REGEN_INTERVAL and self.stamina < STAMINA_MAX:
+                self.stamina = min(STAMINA_MAX, self.stamina + STAMINA_REGEN_AMOUNT)
+                self.stamina_regen_timer -= STAMINA_REGEN_INTERVAL
+            if self.stamina >= STAMINA_MAX:
+                self.stamina_regen_timer = 0.0
+        else:
+            self.stamina_regen_timer = 0.0
+
+        if not self.prev_on_ground and on_ground and self.player_vel_y == 0:
+            feet_x = self.player_pos.x
+            feet_y = self.ground_y if feet_y >= self.ground_y else self.player_pos.y + player_height
+            self.create_particles((feet_x, feet_y), (180, 180, 180), 10)
+        self.prev_on_ground = on_ground
+
+        self.blink_timer -= dt
+        if self.blink_timer <= 0 and self.blink_close <= 0:
+            self.blink_close = 0.12
+            self.blink_timer = self.fx_rng.uniform(2.0, 5.0)
+        if self.blink_close > 0:
+            self.blink_close -= dt
+        if self.shoot_recoil > 0:
+            self.shoot_recoil -= dt
+
+        if self.player_pos.y > DEATH_BELOW_Y:
+            self.respawn_player((255, 100, 100))
+
+    def _update_camera(self):
+        target_x = self.player_pos.x - self.view_width // 2
+        target_y = self.player_pos.y - self.view_height // 2
+        self.camera.x += (target_x - self.camera.x) * CAMERA_LAG_STEP
+        self.camera.y += (target_y - self.camera.y) * CAMERA_LAG_STEP
+
+    def _update_projectiles(self, dt):
+        # Projectiles avec direction
+        pool = self.projectiles
+        pool.integrate(dt)
+        pool.cull(self.camera.x - 200, self.camera.y - 200,
+                  self.camera.x + self.view_width + 200, self.camera.y + self.view_height + 200)
+
+        # Collision projectile-monstre: distances projectile x monstre en un
+        # calcul, puis résolution dans l'ordre (projectiles par ordre de tir,
+        # premier monstre vivant de la liste) pour les seuls projectiles qui
+        # touchent quelque chose
+        monsters = self.monsters
+        n = pool.count
+        if n and monsters:
+            monster_pos = np.array([(monster.pos.x, monster.pos.y) for monster in monsters])
+            reach = np.array([monster.radius for monster in monsters], dtype=float) + projectile_radius
+            delta = pool.pos[:n, None, :] - monster_pos[None, :, :]
+            dist = np.sqrt(delta[:, :, 0] * delta[:, :, 0] + delta[:, :, 1] * delta[:, :, 1])
+            hits = (dist < reach) & pool.alive[:n, None]
+            dead = set()
+            for proj_idx in np.flatnonzero(hits.any(axis=1)).tolist():
+                for monster_idx in np.flatnonzero(hits[proj_idx]).tolist():
+                    if monster_idx in dead:
+                        continue
+                    monster = monsters[monster_idx]
+                    monster.hp -= 1
+                    monster.hit_flash = 0.2
+
+                    if monster.hp <= 0:
+                        self.create_particles(monster.pos, (255, 50, 50), 12)
+                        dead.add(monster_idx)
+                        self.score += 2 if monster.type == "tank" else 1
+
+                    pool.alive[proj_idx] = False
+                    break
+            if dead:
+                for idx in dead:
+                    self.monster_pool.release(monsters[idx])
+                monsters[:] = [monster for idx, monster in enumerate(monsters) if idx not in dead]
+        pool.compact()
+
+    def _update_monsters(self, dt):
+        # Spawn avec cooldown
+        self.monster_spawn_timer -= dt
+        if self.monster_spawn_timer <= 0:
+            spawned = False
+            if self.level_enemy_specs:
+                active_ids = {m.template_id for m in self.monsters if m.template_id is not None}
+                next_id = None
+                for idx in range(len(self.level_enemy_specs)):
+                    if idx not in active_ids:
+                        next_id = idx
+                        break
+                if next_id is not None:
+                    self.monsters.append(self.monster_pool.from_spec(self.level_enemy_specs[next_id],
+                                                                     template_id=next_id))
+                    spawned = True
+            else:
+                if len(self.monsters) < MAX_MONSTERS:
+                    self.monsters.append(self.spawn_monster())
+                    spawned = True
+            if spawned:
+                self.monster_spawn_timer = MONSTER_SPAWN_COOLDOWN
+
+        # Monstres (mouvement, gravité/vol et flash)
+        ground_y = self.ground_y
+        for monster in self.monsters:
+            pos = monster.pos
+            radius = monster.radius
+            # Horizontal
+            pos.x += monster.dir * monster.speed * dt
+            if pos.x < 50:
+                monster.dir = 1
+            if pos.x > 2500:
+                monster.dir = -1
+
+            if monster.flyer:
+                # Vol stationnaire/ondulant
+                monster.fly_phase += dt * 2.0
+                pos.y = monster.base_y + math.sin(monster.fly_phase) * 25
+            else:
+                # Gravité (marcheurs)
+                monster.vel_y += GRAVITY * dt
+                pos.y += monster.vel_y * dt
+
+                # Collision sol
+                feet_y = pos.y + radius
+                if feet_y > ground_y:
+                    pos.y = ground_y - radius
+                    monster.vel_y = 0
+
+                # Collision plateformes (atterrir par dessus)
+                if monster.vel_y >= 0:
+                    monster_rect = pygame.Rect(int(pos.x - radius), int(pos.y - radius), radius*2, radius*2)
+                    for plat in self.platforms_near(monster_rect.left, monster_rect.top,
+                                                    monster_rect.right, monster_rect.bottom):
+                        if monster_rect.colliderect(plat):
+                            plat_top = plat.top
+                            if feet_y - monster.vel_y * dt <= plat_top + 2:
+                                pos.y = plat_top - radius
+                                monster.vel_y = 0
+                                break
+
+            # Flash dégâts
+            if monster.hit_flash > 0:
+                monster.hit_flash -= dt
+
+        # Collision joueur-ennemi
+        if not self.is_invulnerable:
+            rect = self.player_rect
+            for monster in self.monsters:
+                if circle_rect_collision((monster.pos.x, monster.pos.y), monster.radius, rect):
+                    self.respawn_player((255, 255, 100))
+                    break
+
+        if self.is_invulnerable:
+            self.invuln_timer -= dt
+            if self.invuln_timer <= 0:
+                self.is_invulnerable = False
+
+    def _update_particles(self, dt):
+        self.particles.update(dt)
+
+    def _update_goal(self):
+        # Victoire
+        if (not self.victory and not self.level_transition_active and
+            pygame.Rect(int(self.player_pos.x - head_radius), int(self.player_pos.y - head_radius),
+                        head_radius*2, head_radius*2).colliderect(self.goal_rect)):
+            self.events.append(("goal", self.level_idx))
+            if self.level_idx < len(self.levels) - 1:
+                self.level_transition_active = True
+                self.level_transition_phase = "fade_out"
+                self.level_transition_timer = 0.0
+                self.level_transition_next_idx = self.level_idx + 1
+            else:
+                self.victory = True
+
+    def _update_level_transition(self, dt):
+        # Fondu au noir, changement de niveau au plus sombre, puis retour
+        if not self.level_transition_active:
+            return
+        self.level_transition_timer += dt
+        if self.level_transition_phase == "fade_out":
+            if self.level_transition_timer >= LEVEL_TRANSITION_FADE_OUT:
+                self.load_level(self.level_transition_next_idx)
+                self.level_transition_phase = "fade_in"
+                self.level_transition_timer = 0.0
+        elif self.level_transition_timer >= LEVEL_TRANSITION_FADE_IN:
+            self.level_transition_active = False
+            self.level_transition_next_idx = None
+            self.level_transition_phase = "fade_out"
+            self.level_transition_timer = 0.0
+
+    def transition_alpha(self):
+        """Opacité (0-255) du voile de changement de niveau."""
+        if not self.level_transition_active:
+            return 0
+        if self.level_transition_phase == "fade_out":
+            if LEVEL_TRANSITION_FADE_OUT <= 0:
+                return 255
+            return min(255, int((self.level_transition_timer / LEVEL_TRANSITION_FADE_OUT) * 255))
+        if LEVEL_TRANSITION_FADE_IN <= 0:
+            return 0
+        return max(0, 255 - int((self.level_transition_timer / LEVEL_TRANSITION_FADE_IN) * 255))
@@ -1,9 +1,4 @@
-def draw_tutorial_overlay():
-    global tutorial_button_rect
-    if not tutorial_visible or not current_tutorial_texts:
-        tutorial_button_rect = None
-        return
-
+def _tutorial_panel_layout():
     panel_margin_x = 50
     panel_margin_y = 30
     panel_width = SCREEN_WIDTH - panel_margin_x * 2
@@ -12,21 +7,23 @@ def draw_tutorial_overlay():
     panel_y = SCREEN_HEIGHT - panel_height - panel_margin_y
     panel_rect = pygame.Rect(panel_x, panel_y, panel_width, panel_height)
 
-    tutorial_button_rect = panel_rect.copy()
-
-    panel_surface = pygame.Surface((panel_rect.width, panel_rect.height), pygame.SRCALPHA)
-    panel_surface.fill((12, 23, 42, 220))
-    pygame.draw.rect(panel_surface, (56, 130, 203, 220), panel_surface.get_rect(), 3, border_radius=18)
-
     content_padding = 24
     text_area_width = panel_rect.width - content_padding * 2
     image_surface = _get_tutorial_image(220, panel_height - content_padding * 2)
-    image_width = image_surface.get_width() if image_surface else 0
     if image_surface:
-        text_area_width -= image_width + 24
+        text_area_width -= image_surface.get_width() + 24
+    return panel_rect, content_padding, text_area_width, image_surface
+
+def _render_tutorial_panel():
+    panel_rect, content_padding, text_area_width, image_surface = _tutorial_panel_layout()
+    image_width = image_surface.get_width() if image_surface else 0
+
+    panel_surface = pygame.Surface((panel_rect.width, panel_rect.height), pygame.SRCALPHA)
+    panel_surface.fill((12, 23, 42, 220))
+    pygame.draw.rect(panel_surface, (56, 130, 203, 220), panel_surface.get_rect(), 3, border_radius=18)
 
     current_text = current_tutorial_texts[min(tutorial_index, len(current_tutorial_texts) - 1)]
-    wrapped_lines = _wrap_text_lines(current_text, small_font, text_area_width)
+    wrapped_lines = get_tutorial_wrapped_lines(current_text, text_area_width)
 
     text_x = content_padding
     text_y = content_padding
@@ -50,14 +47,44 @@ def draw_tutorial_overlay():
         img_y = (panel_rect.height - image_surface.get_height()) // 2
         panel_surface.blit(image_surface, (img_x, img_y))
 
-    screen.blit(panel_surface, panel_rect.topleft)
+    return panel_surface, panel_rect
+
+def draw_tutorial_overlay():
+    global tutorial_button_rect
+    if not tutorial_visible or not current_tutorial_texts:
+        tutorial_button_rect = None
+        return
+
+    # Panneau rendu une fois par (étape, taille d'écran), réutilisé ensuite
+    key = (tutorial_index, SCREEN_WIDTH, SCREEN_HEIGHT)
+    if tutorial_overlay_cache["key"] != key:
+        tutorial_overlay_cache["surface"], tutorial_overlay_cache["rect"] = _render_tutorial_panel()
+        tutorial_overlay_cache["key"] = key
+    panel_rect = tutorial_overlay_cache["rect"]
+    tutorial_button_rect = panel_rect.copy()
+    mark_dirty(screen.blit(tutorial_overlay_cache["surface"], panel_rect.topleft))
 
 import pygame
+import numpy as np
 import random
 import math
 import json
 import os
-from copy import deepcopy
+import argparse
+from collections import OrderedDict
+from moteur import (World, Inputs, STAMINA_MAX, FIXED_DT, head_radius, body_height, leg_height,
+                    projectile_radius)
+from replay import ReplayRecorder
+
+# === Options ===
+parser = argparse.ArgumentParser(description="Mon Jeu")
+parser.add_argument("--seed", type=int, default=None,
+                    help="graine de l'aléatoire: même graine + mêmes entrées = même partie")
+parser.add_argument("--record", metavar="FICHIER", default=None,
+                    help="enregistre les entrées de la partie (relecture: python replay.py FICHIER)")
+args = parser.parse_args()
+if args.seed is not None and not 0 <= args.seed < 2**32:
+    parser.error("--seed doit être compris entre 0 et 2**32 - 1")
 
 # === Initialisation ===
 pygame.init()
@@ -67,6 +94,44 @@ font = pygame.font.SysFont(None, 48)
 small_font = pygame.font.SysFont(None, 32)
 title_font = pygame.font.SysFont(None, 96)
 fword_font = pygame.font.SysFont(None, 180)
+victory_font = pygame.font.SysFont(None, 120)
+
+# === Cache de rendu du texte ===
+# Les textes sont rendus une fois par (police, texte, couleur, anticrénelage)
+# et gardés en LRU. Les champs numériques sont composés chiffre par chiffre à
+# partir des glyphes en cache, pour ne jamais rastériser pendant le jeu.
+TEXT_CACHE_MAX = 256
+text_cache = OrderedDict()
+
+def render_text(text_font, text, color, antialias=True):
+    key = (text_font, text, tuple(color), antialias)
+    surf = text_cache.get(key)
+    if surf is not None:
+        text_cache.move_to_end(key)
+        return surf
+    surf = text_font.render(text, antialias, color)
+    text_cache[key] = surf
+    while len(text_cache) > TEXT_CACHE_MAX:
+        text_cache.popitem(last=False)
+    return surf
+
+def _number_text_glyphs(text_font, label, number_text, color, suffix=""):
+    glyphs = [render_text(text_font, label, color)] if label else []
+    glyphs.extend(render_text(text_font, ch, color) for ch in number_text)
+    if suffix:
+        glyphs.append(render_text(text_font, suffix, color))
+    return glyphs
+
+def blit_number_text(target, text_font, label, number_text, color, pos, suffix="", centered=False):
+    glyphs = _number_text_glyphs(text_font, label, number_text, color, suffix)
+    x, y = pos
+    if centered:
+        x -= sum(g.get_width() for g in glyphs) // 2
+    area = pygame.Rect(x, y, 0, 0)
+    for glyph in glyphs:
+        area.union_ip(target.blit(glyph, (x, y)))
+        x += glyph.get_width()
+    return area
 
 tutorial_texts = {}
 current_tutorial_texts = []
@@ -75,11 +140,24 @@ tutorial_index = 0
 tutorial_button_rect = None
 tutorial_image = None
 tutorial_image_cache = {}
+tutorial_overlay_cache = {"key": None, "surface": None, "rect": None}
+tutorial_wrap_cache = {}
+word_width_cache = {}
+
+def _word_width(font, word):
+    key = (font, word)
+    width = word_width_cache.get(key)
+    if width is None:
+        width = font.size(word)[0]
+        word_width_cache[key] = width
+    return width
 
 def _wrap_text_lines(text, font, max_width):
+    # Largeurs des mots mémorisées: plus de font.size() sur chaque préfixe
     lines = []
     if not text:
         return lines
+    space_width = _word_width(font, " ")
     for raw_paragraph in text.split("\n"):
         paragraph = raw_paragraph.strip()
         if not paragraph:
@@ -87,16 +165,37 @@ def _wrap_text_lines(text, font, max_width):
             continue
         words = paragraph.split()
         current = words[0]
+        current_width = _word_width(font, current)
         for word in words[1:]:
-            potential = f"{current} {word}"
-            if font.size(potential)[0] <= max_width:
-                current = potential
+            word_width = _word_width(font, word)
+            if current_width + space_width + word_width <= max_width:
+                current = f"{current} {word}"
+                current_width += space_width + word_width
             else:
                 lines.append(current)
                 current = word
+                current_width = word_width
         lines.append(current)
     return lines
 
+def get_tutorial_wrapped_lines(text, max_width):
+    key = (text, max_width)
+    lines = tutorial_wrap_cache.get(key)
+    if lines is None:
+        lines = _wrap_text_lines(text, small_font, max_width)
+        tutorial_wrap_cache[key] = lines
+    return lines
+
+def invalidate_tutorial_overlay():
+    tutorial_overlay_cache["key"] = None
+
+def precompute_tutorial_wrapping():
+    # Découpe en lignes de tous les textes du tutoriel, une fois au chargement
+    text_area_width = _tutorial_panel_layout()[2]
+    for entries in tutorial_texts.values():
+        for text in entries:
+            get_tutorial_wrapped_lines(text, text_area_width)
+
 def _get_tutorial_image(max_width, max_height):
     if tutorial_image is None:
         return None
@@ -197,6 +296,7 @@ tutorial_image = load_tutorial_image()
 
 def select_tutorial_for_level(level):
     global current_tutorial_texts, tutorial_visible, tutorial_index
+    invalidate_tutorial_overlay()
     if not level:
         current_tutorial_texts = []
         tutorial_visible = False
@@ -241,37 +341,32 @@ def advance_tutorial_text():
         tutorial_visible = False
         tutorial_index = len(current_tutorial_texts) - 1
     tutorial_index = max(0, tutorial_index)
+    invalidate_tutorial_overlay()
 
 # === Constantes ===
 SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
-GROUND_Y = 680
-GROUND_START_X = 0
-GROUND_END_X = 3000
-
-GRAVITY = 800
-JUMP_FORCE = -600
-MOVE_SPEED = 300
-PROJECTILE_SPEED = 800
-STAMINA_MAX = 100
-STAMINA_JUMP_COST = 10
-STAMINA_REGEN_DELAY = 4.0
-STAMINA_REGEN_INTERVAL = 0.5
-STAMINA_REGEN_AMOUNT = 5
-DOUBLE_JUMP_COST = 15
-DASH_COST = 10
-DASH_SPEED = 900
-DASH_DURATION = 0.2
-FPS = 60
-MAX_MONSTERS = 3
-MONSTER_SPAWN_COOLDOWN = 2.0  # Secondes entre chaque spawn
-DEATH_BELOW_Y = GROUND_Y + 1500
+FPS = 60  # cadence d'affichage (la simulation tourne à moteur.SIM_HZ)
+
+# === Monde (état de jeu, voir moteur.py) ===
+world = World(view_size=(SCREEN_WIDTH, SCREEN_HEIGHT), seed=args.seed)
 
 # === Caméra ===
-camera_offset = pygame.Vector2(0, 0)
-CAMERA_LAG = 0.05
+camera_offset = pygame.Vector2(0, 0)  # caméra d'affichage (interpolée)
+
+def get_view_rect(margin=0):
+    # Rectangle du monde actuellement visible (pour ne dessiner que l'utile)
+    return pygame.Rect(int(camera_offset.x) - margin, int(camera_offset.y) - margin,
+                       SCREEN_WIDTH + 2 * margin, SCREEN_HEIGHT + 2 * margin)
 
 # === Couleurs améliorées ===
 SKY_COLOR = (70, 130, 180)
+SKY_TOP_COLOR = SKY_COLOR
+SKY_BOTTOM_COLOR = (130, 180, 230)
+# Montagnes: (couleur, facteur de parallax, hauteur de base)
+MOUNTAIN_LAYERS = [((90, 110, 140), 0.2, 180), ((80, 100, 130), 0.35, 260), ((70, 90, 120), 0.5, 340)]
+MOUNTAIN_AMPLITUDE = 40
+MOUNTAIN_PERIODS_PER_STRIP = 3  # ondulations par bande (sin(x * 0.01) => ~628 px)
+MOUNTAIN_POINTS_PER_PERIOD = 5  # un sommet tous les ~120 px comme avant
 GROUND_COLOR = (34, 139, 34)
 PLATFORM_COLOR = (101, 67, 33)
 PLATFORM_HIGHLIGHT = (139, 90, 43)
@@ -283,338 +378,700 @@ SHOE_COLOR = (40, 40, 40)
 HAND_COLOR = (255, 220, 177)
 HAIR_COLOR = (60, 40, 20)
 
-# === Particules ===
-particles = []
-
-def create_particles(pos, color, count=8):
-    """Crée des particules d'explosion"""
-    for _ in range(count):
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(50, 150)
-        particles.append({
-            "pos": pygame.Vector2(pos),
-            "vel": pygame.Vector2(math.cos(angle) * speed, math.sin(angle) * speed),
-            "color": color,
-            "life": 1.0
-        })
-
-def circle_rect_collision(center, radius, rect):
-    cx, cy = center
-    closest_x = max(rect.left, min(cx, rect.right))
-    closest_y = max(rect.top, min(cy, rect.bottom))
-    dx = cx - closest_x
-    dy = cy - closest_y
-    return dx * dx + dy * dy <= radius * radius
+# === Cache des couches de fond ===
+# Les couches fixes (ciel dégradé...) sont pré-calculées une seule fois par
+# résolution et par thème, puis affichées en un seul blit par frame.
+background_cache = {"key": None, "layers": {}}
+
+def invalidate_background_cache():
+    background_cache["key"] = None
+    background_cache["layers"] = {}
+
+def _background_layers():
+    key = (SCREEN_WIDTH, SCREEN_HEIGHT, SKY_TOP_COLOR, SKY_BOTTOM_COLOR, tuple(MOUNTAIN_LAYERS))
+    if background_cache["key"] != key:
+        background_cache["key"] = key
+        background_cache["layers"] = {}
+    return background_cache["layers"]
+
+def set_sky_theme(top_color, bottom_color):
+    global SKY_TOP_COLOR, SKY_BOTTOM_COLOR
+    SKY_TOP_COLOR = tuple(top_color)
+    SKY_BOTTOM_COLOR = tuple(bottom_color)
+    invalidate_background_cache()
+
+def _build_sky_surface():
+    sky = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    for i in range(SCREEN_HEIGHT):
+        color = tuple(
+            int(top + (bottom - top) * i / SCREEN_HEIGHT)
+            for top, bottom in zip(SKY_TOP_COLOR, SKY_BOTTOM_COLOR)
+        )
+        pygame.draw.line(sky, color, (0, i), (SCREEN_WIDTH, i))
+    return sky
+
+def draw_sky():
+    layers = _background_layers()
+    sky = layers.get("ciel")
+    if sky is None:
+        sky = _build_sky_surface()
+        layers["ciel"] = sky
+    screen.blit(sky, (0, 0))
+
+def _build_mountain_strip(color, base_y):
+    # Bande répétable horizontalement: un nombre entier de périodes de la sinusoïde
+    period = 2 * math.pi / 0.01
+    strip_width = int(round(period * MOUNTAIN_PERIODS_PER_STRIP))
+    top = max(0, base_y - MOUNTAIN_AMPLITUDE)
+    strip = pygame.Surface((strip_width, max(1, SCREEN_HEIGHT - top)), pygame.SRCALPHA)
+    steps = MOUNTAIN_PERIODS_PER_STRIP * MOUNTAIN_POINTS_PER_PERIOD
+    points = []
+    for k in range(steps + 1):
+        x = strip_width * k / steps
+        y = base_y + int(MOUNTAIN_AMPLITUDE * math.sin(2 * math.pi * MOUNTAIN_PERIODS_PER_STRIP * k / steps))
+        points.append((x, y - top))
+    points = [(0, strip.get_height()), *points, (strip_width, strip.get_height())]
+    pygame.draw.polygon(strip, color, points)
+    return strip.convert_alpha(), top
+
+def draw_mountains():
+    layers = _background_layers()
+    for idx, (col, factor, base_y) in enumerate(MOUNTAIN_LAYERS):
+        cached = layers.get(("montagnes", idx))
+        if cached is None:
+            cached = _build_mountain_strip(col, base_y)
+            layers[("montagnes", idx)] = cached
+        strip, top = cached
+        strip_width = strip.get_width()
+        x = -(int(camera_offset.x * factor) % strip_width)
+        while x < SCREEN_WIDTH:
+            screen.blit(strip, (x, top))
+            x += strip_width
 
 # === Nuages et Parallax ===
 clouds = []
+cloud_rng = random.Random(args.seed)  # flux cosmétique propre à l'affichage
+
+# Échelles pré-calculées des nuages (0.6 à 1.4 par pas de 0.1)
+CLOUD_SCALES = [round(0.6 + 0.1 * i, 1) for i in range(9)]
+CLOUD_ELLIPSES = [(-40, 10, 90, 50), (0, 0, 120, 60), (60, 15, 80, 45)]
+cloud_sprites = {}
+
+def _build_cloud_sprite(scale):
+    # Nuage composé de plusieurs ellipses, rendu une fois avec transparence
+    rects = [pygame.Rect(int(ox*scale), int(oy*scale), int(w*scale), int(h*scale))
+             for ox, oy, w, h in CLOUD_ELLIPSES]
+    bounds = rects[0].unionall(rects[1:])
+    surf = pygame.Surface(bounds.size, pygame.SRCALPHA)
+    for rect in rects:
+        pygame.draw.ellipse(surf, (255, 255, 255), rect.move(-bounds.x, -bounds.y))
+    return surf.convert_alpha(), bounds.topleft
+
+def build_cloud_sprites():
+    cloud_sprites.clear()
+    for scale in CLOUD_SCALES:
+        cloud_sprites[scale] = _build_cloud_sprite(scale)
+
+def _nearest_cloud_scale(scale):
+    return min(CLOUD_SCALES, key=lambda s: abs(s - scale))
 
 def init_clouds():
     global clouds
     clouds = []
     for i in range(12):
-        x = random.randint(-200, 3000)
-        y = random.randint(50, 300)
-        speed = random.uniform(10, 30)
-        scale = random.uniform(0.6, 1.4)
+        x = cloud_rng.randint(-200, 3000)
+        y = cloud_rng.randint(50, 300)
+        speed = cloud_rng.uniform(10, 30)
+        scale = _nearest_cloud_scale(cloud_rng.uniform(0.6, 1.4))
         clouds.append({"x": x, "y": y, "speed": speed, "scale": scale})
 
 def update_clouds(dt):
     for c in clouds:
         c["x"] += c["speed"] * dt
         if c["x"] - camera_offset.x > 3200:
-            c["x"] = camera_offset.x - random.randint(200, 600)
-            c["y"] = random.randint(50, 300)
-            c["speed"] = random.uniform(10, 30)
+            c["x"] = camera_offset.x - cloud_rng.randint(200, 600)
+            c["y"] = cloud_rng.randint(50, 300)
+            c["speed"] = cloud_rng.uniform(10, 30)
 
 def draw_cloud(screen, x, y, scale):
-    # Nuage composé de plusieurs ellipses
-    color = (255, 255, 255)
-    offsets = [(-40, 10, 90, 50), (0, 0, 120, 60), (60, 15, 80, 45)]
-    for ox, oy, w, h in offsets:
-        rect = pygame.Rect(int(x + ox*scale), int(y + oy*scale), int(w*scale), int(h*scale))
-        pygame.draw.ellipse(screen, color, rect)
+    # Un seul blit du sprite pré-calculé à l'échelle la plus proche
+    if not cloud_sprites:
+        build_cloud_sprites()
+    sprite, (ox, oy) = cloud_sprites[_nearest_cloud_scale(scale)]
+    return screen.blit(sprite, (int(x) + ox, int(y) + oy))
 
 def draw_parallax_background():
-    # Ciel dégradé
-    for i in range(SCREEN_HEIGHT):
-        color = (
-            int(70 + (130 - 70) * i / SCREEN_HEIGHT),
-            int(130 + (180 - 130) * i / SCREEN_HEIGHT),
-            int(180 + (230 - 180) * i / SCREEN_HEIGHT)
-        )
-        pygame.draw.line(screen, color, (0, i), (SCREEN_WIDTH, i))
-
-    # Montagnes (3 couches)
-    layers = [((90, 110, 140), 0.2, 180), ((80, 100, 130), 0.35, 260), ((70, 90, 120), 0.5, 340)]
-    for col, factor, base_y in layers:
-        points = []
-        start_x = -int(camera_offset.x * factor) - 300
-        for x in range(start_x, start_x + SCREEN_WIDTH + 600, 120):
-            y = base_y + int(40 * math.sin(x * 0.01))
-            points.append((x, y))
-        points = [(-1000, SCREEN_HEIGHT), *points, (SCREEN_WIDTH + 1000, SCREEN_HEIGHT)]
-        pygame.draw.polygon(screen, col, points)
+    # Ciel dégradé (pré-calculé)
+    draw_sky()
+
+    # Montagnes (3 couches pré-calculées, défilement par blits)
+    draw_mountains()
 
     # Nuages (parallax léger)
     for c in clouds:
         cx = c["x"] - camera_offset.x * 0.2
         cy = c["y"] - camera_offset.y * 0.2
-        draw_cloud(screen, cx, cy, c["scale"])
+        mark_dirty(draw_cloud(screen, cx, cy, c["scale"]))
+
+# Ombres pré-calculées, indexées par rayon entier
+shadow_cache = {}
+
+def _get_shadow_surface(max_radius):
+    key = int(max_radius)
+    surf = shadow_cache.get(key)
+    if surf is None:
+        width = max(1, int(key * 2.4))
+        height = max(6, int(key * 0.5))
+        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.ellipse(surf, (0, 0, 0, 90), surf.get_rect())
+        surf = surf.convert_alpha()
+        shadow_cache[key] = surf
+    return surf
 
 def draw_shadow(center_x, feet_y_world, max_radius):
-    # Ombre douce au sol
+    # Ombre douce au sol (ignorée si hors de l'écran)
     shadow_y = int(feet_y_world - camera_offset.y)
     shadow_x = int(center_x - camera_offset.x)
-    width = int(max_radius * 2.4)
-    height = max(6, int(max_radius * 0.5))
-    surf = pygame.Surface((width, height), pygame.SRCALPHA)
-    pygame.draw.ellipse(surf, (0, 0, 0, 90), surf.get_rect())
-    screen.blit(surf, (shadow_x - width//2, shadow_y - height//2))
-
-# === Joueur ===
-player_pos = pygame.Vector2(SCREEN_WIDTH / 2, GROUND_Y)
-head_radius = 20
-body_height = 40
-leg_height = 30
+    half_w = int(max_radius * 1.2) + 1
+    half_h = max(3, int(max_radius * 0.25)) + 1
+    if (shadow_x + half_w < 0 or shadow_x - half_w > SCREEN_WIDTH or
+            shadow_y + half_h < 0 or shadow_y - half_h > SCREEN_HEIGHT):
+        return None
+    surf = _get_shadow_surface(max_radius)
+    return screen.blit(surf, (shadow_x - surf.get_width()//2, shadow_y - surf.get_height()//2))
+
+# === Joueur (dessin; tailles et état dans moteur.py) ===
 arm_length = 25
 skin_color = (255, 220, 177)
-player_vel_y = 0
-direction = 1
-walk_cycle = 0
-blink_timer = 0.0
-blink_close = 0.0
-prev_on_ground = True
-shoot_recoil = 0.0
-stamina = STAMINA_MAX
-stamina_idle_timer = 0.0
-stamina_regen_timer = 0.0
-air_jumps_left = 1
-jump_was_pressed = False
-dash_was_pressed = False
-dash_timer = 0.0
-dash_direction = 1
-
-player_pos.y = GROUND_Y - (head_radius + body_height + leg_height)
-spawn_point = player_pos.copy()
-
-# === Projectiles ===
-projectiles = []
-projectile_radius = 6
-
-# === Ennemis ===
-monster_radius = 25
-monster_spawn_timer = 0.0
-
-def spawn_monster():
-    x = random.randint(100, 2500)
-    # Types: tank (gros/lent), fast (petit/rapide), flyer (vole)
-    r = random.random()
-    if r < 0.3:
-        m_type = "tank"
-        radius = 32
-        speed = 60
-        hp = 3
-        y = GROUND_Y - radius
-        extra = {"vel_y": 0.0}
-    elif r < 0.7:
-        m_type = "fast"
-        radius = 18
-        speed = 140
-        hp = 1
-        y = GROUND_Y - radius
-        extra = {"vel_y": 0.0}
+
+# === Personnalisation du personnage (sexe, métier, tenue: voir README) ===
+# Le dessin n'en dépend pas encore; tout changement reconstruit l'atlas.
+player_appearance = {"sexe": None, "metier": None, "tenue": None}
+
+def set_player_appearance(**changes):
+    player_appearance.update(changes)
+    invalidate_player_atlas()
+
+# === Atlas du joueur ===
+# Le corps (tête, visage, torse, bras, cheveux) est pré-rendu par pose; seul le
+# pistolet, qui suit la souris, est dessiné en direct.
+PLAYER_RECOIL_BUCKETS = 4
+PLAYER_ATLAS_SIZE = (90, 100)
+PLAYER_ATLAS_CENTER = (45, 26)  # position du centre de la tête dans l'image
+player_atlas = {}
+
+def invalidate_player_atlas():
+    player_atlas.clear()
+
+def _player_arm_pose(walk_cycle, shoot_recoil, on_ground):
+    arm_angle = math.sin(walk_cycle * 10) * 15
+    arm_offset = arm_length * math.cos(math.radians(arm_angle))
+    recoil_bucket = 0
+    if shoot_recoil > 0:
+        recoil_bucket = min(PLAYER_RECOIL_BUCKETS, math.ceil(shoot_recoil / 0.12 * PLAYER_RECOIL_BUCKETS))
+        arm_offset *= 1.0 - (recoil_bucket / PLAYER_RECOIL_BUCKETS) * 0.6
+    if not on_ground:
+        arm_offset *= 0.6
+    return int(arm_offset), recoil_bucket
+
+def _build_player_frame(facing, blinking, moving, on_ground, recoil_bucket, arm_px):
+    surf = pygame.Surface(PLAYER_ATLAS_SIZE, pygame.SRCALPHA)
+    cx, cy = PLAYER_ATLAS_CENTER
+
+    # Tête avec contour
+    pygame.draw.circle(surf, skin_color, (cx, cy), head_radius)
+    pygame.draw.circle(surf, (0, 0, 0), (cx, cy), head_radius, 3)
+
+    # Visage
+    eye_offset = 7
+    eye_pos = (cx - eye_offset * facing, cy - 5)
+    if blinking:
+        pygame.draw.line(surf, (0, 0, 0), (eye_pos[0]-3, eye_pos[1]), (eye_pos[0]+3, eye_pos[1]), 2)
     else:
-        m_type = "flyer"
-        radius = 22
-        speed = 110
-        hp = 1
-        base_y = random.randint(GROUND_Y - 280, GROUND_Y - 140)
-        y = base_y
-        extra = {"fly_phase": random.uniform(0, 6.28), "base_y": base_y}
-
-    data = {
-        "pos": pygame.Vector2(x, y),
-        "dir": random.choice([-1, 1]),
-        "type": m_type,
-        "radius": radius,
-        "speed": speed,
-        "hp": hp,
-        "hit_flash": 0.0,
-    }
-    data.update(extra)
-    return data
-
-MONSTER_TYPE_DEFAULTS = {
-    "tank": {"radius": 32, "speed": 60, "hp": 3, "dir": 1},
-    "fast": {"radius": 18, "speed": 140, "hp": 1, "dir": 1},
-    "flyer": {"radius": 22, "speed": 110, "hp": 1, "dir": 1},
-    "basic": {"radius": 20, "speed": 100, "hp": 1, "dir": 1},
+        pygame.draw.circle(surf, (0, 0, 0), eye_pos, 3)
+    pygame.draw.arc(surf, (0, 0, 0),
+                   (cx - head_radius, cy - head_radius, head_radius*2, head_radius*2), 3.8, 5.0, 3)
+
+    # Cou + Torse (rectangle arrondi comme un t-shirt)
+    neck_width = 10
+    neck_height = 6
+    neck_rect = pygame.Rect(cx - neck_width//2, cy + head_radius - 2, neck_width, neck_height)
+    pygame.draw.rect(surf, HAND_COLOR, neck_rect, border_radius=3)
+
+    torso_width = 26
+    tilt = facing * (2 if moving else 0)
+    torso_rect = pygame.Rect(0, 0, torso_width, body_height)
+    torso_rect.centerx = cx + int(tilt)
+    torso_rect.top = cy + head_radius
+    pygame.draw.rect(surf, SHIRT_COLOR, torso_rect, border_radius=6)
+    pygame.draw.rect(surf, (0, 0, 0), torso_rect, 2, border_radius=6)
+
+    # Bras (recul au tir et pose en l'air) plus épais avec mains
+    arm_y = cy + head_radius + 16 - (6 if not on_ground else 0)
+    if recoil_bucket > 0:
+        arm_y -= 2
+    left_hand = (cx - arm_px, arm_y)
+    right_hand = (cx + arm_px, arm_y)
+    pygame.draw.line(surf, (0, 0, 0), left_hand, right_hand, 6)
+    pygame.draw.circle(surf, HAND_COLOR, left_hand, 4)
+    pygame.draw.circle(surf, HAND_COLOR, right_hand, 4)
+
+    # Cheveux simples
+    hair_rect = pygame.Rect(cx - head_radius + 4, cy - head_radius + 2, head_radius*2 - 8, head_radius)
+    pygame.draw.arc(surf, HAIR_COLOR, hair_rect, math.radians(200), math.radians(340), 4)
+
+    # Positions des mains relatives au centre de la tête (pour le pistolet)
+    hands = ((left_hand[0] - cx, left_hand[1] - cy), (right_hand[0] - cx, right_hand[1] - cy))
+    return surf.convert_alpha(), hands
+
+def get_player_frame(facing, blinking, moving, on_ground, walk_cycle, shoot_recoil):
+    arm_px, recoil_bucket = _player_arm_pose(walk_cycle, shoot_recoil, on_ground)
+    key = (facing, bool(blinking), bool(moving), bool(on_ground), recoil_bucket, arm_px)
+    frame = player_atlas.get(key)
+    if frame is None:
+        frame = _build_player_frame(*key)
+        player_atlas[key] = frame
+    return frame
+
+# === Sprites des monstres ===
+# Chaque type est pré-rendu à son rayon, en version normale/flash et par sens.
+MONSTER_COLORS = {
+    "tank": (200, 40, 40),
+    "fast": (255, 140, 0),
+    "flyer": (100, 160, 255),
 }
+MONSTER_DEFAULT_COLOR = (220, 20, 20)
+MONSTER_FLASH_COLOR = (255, 220, 220)
+monster_sprite_cache = {}
+
+def _build_monster_sprite(m_type, r, flashing, facing):
+    half = max(r + 14, 32)
+    surf = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+    center = (half, half)
+    monster_color = MONSTER_FLASH_COLOR if flashing else MONSTER_COLORS.get(m_type, MONSTER_DEFAULT_COLOR)
+
+    if m_type == "tank":
+        # Corps plus gros + contour
+        pygame.draw.circle(surf, monster_color, center, r)
+        pygame.draw.circle(surf, (0, 0, 0), center, r, 3)
+        # Sac à dos / blindage
+        backpack_x = center[0] - 18
+        backpack_y = center[1]
+        backpack_rect = pygame.Rect(backpack_x - 12, backpack_y - 18, 24, 36)
+        pygame.draw.rect(surf, (60, 40, 20), backpack_rect)
+        pygame.draw.rect(surf, (0, 0, 0), backpack_rect, 2)
+        pygame.draw.circle(surf, (100, 80, 50), (backpack_x, backpack_y - 6), 5)
+        # Yeux
+        pygame.draw.circle(surf, (255, 255, 0), (center[0] - 9, center[1] - 6), 4)
+        pygame.draw.circle(surf, (255, 255, 0), (center[0] + 9, center[1] - 6), 4)
+        pygame.draw.circle(surf, (0, 0, 0), (center[0] - 9, center[1] - 6), 2)
+        pygame.draw.circle(surf, (0, 0, 0), (center[0] + 9, center[1] - 6), 2)
+    elif m_type == "fast":
+        # Petit rapide
+        pygame.draw.circle(surf, monster_color, center, r)
+        pygame.draw.circle(surf, (0, 0, 0), center, r, 3)
+        # Yeux plus rapprochés
+        pygame.draw.circle(surf, (0, 0, 0), (center[0] - 6, center[1] - 4), 3)
+        pygame.draw.circle(surf, (0, 0, 0), (center[0] + 6, center[1] - 4), 3)
+        # Traînée légère
+        pygame.draw.circle(surf, (255, 200, 120), (center[0] - facing*r, center[1]), max(1, r//4))
+    else:  # flyer
+        # Corps volant avec ailes
+        pygame.draw.circle(surf, monster_color, center, r)
+        pygame.draw.circle(surf, (0, 0, 0), center, r, 3)
+        wing_span = r + 10
+        left_wing = [(center[0] - 2, center[1]),
+                     (center[0] - wing_span, center[1] - 6),
+                     (center[0] - wing_span + 6, center[1] + 6)]
+        right_wing = [(center[0] + 2, center[1]),
+                      (center[0] + wing_span, center[1] - 6),
+                      (center[0] + wing_span - 6, center[1] + 6)]
+        pygame.draw.polygon(surf, (180, 210, 255), left_wing)
+        pygame.draw.polygon(surf, (180, 210, 255), right_wing)
+        pygame.draw.polygon(surf, (0, 0, 0), left_wing, 2)
+        pygame.draw.polygon(surf, (0, 0, 0), right_wing, 2)
+    return surf.convert_alpha()
+
+def get_monster_sprite(m_type, radius, flashing, facing):
+    key = (m_type, int(radius), bool(flashing), -1 if facing < 0 else 1)
+    sprite = monster_sprite_cache.get(key)
+    if sprite is None:
+        sprite = _build_monster_sprite(*key)
+        monster_sprite_cache[key] = sprite
+    return sprite
+
+# === Niveaux ===
+selected_level_idx = 0  # niveau choisi au menu
+
+# === Sprites des particules ===
+# Une pastille pré-rendue par (couleur, niveau de vie): l'assombrissement
+# progressif est quantifié en PARTICLE_SHADES teintes, et toutes les
+# particules visibles partent en un seul appel à screen.blits().
+PARTICLE_RADIUS = 3
+PARTICLE_SHADES = 16
+PARTICLE_COLORKEY = (255, 0, 255)
+particle_sprite_cache = {}
+
+def _get_particle_sprite(color, shade):
+    key = (color, shade)
+    sprite = particle_sprite_cache.get(key)
+    if sprite is None:
+        factor = shade / PARTICLE_SHADES
+        shade_color = tuple(min(255, max(0, int(c * factor))) for c in color)
+        size = PARTICLE_RADIUS * 2 + 1
+        sprite = pygame.Surface((size, size))
+        sprite.fill(PARTICLE_COLORKEY)
+        pygame.draw.circle(sprite, shade_color, (PARTICLE_RADIUS, PARTICLE_RADIUS), PARTICLE_RADIUS)
+        sprite = sprite.convert()
+        sprite.set_colorkey(PARTICLE_COLORKEY, pygame.RLEACCEL)
+        particle_sprite_cache[key] = sprite
+    return sprite
+
+def draw_particles():
+    system = world.particles
+    n = system.count
+    if not n:
+        return
+    screen_pos = (system.pos[:n] - (camera_offset.x, camera_offset.y)).astype(int) - PARTICLE_RADIUS
+    life = system.life[:n]
+    size = PARTICLE_RADIUS * 2 + 1
+    visible = ((life > 0) & (screen_pos[:, 0] > -size) & (screen_pos[:, 0] < SCREEN_WIDTH) &
+               (screen_pos[:, 1] > -size) & (screen_pos[:, 1] < SCREEN_HEIGHT))
+    if not visible.any():
+        return
+    shades = np.clip(np.ceil(life[visible] * PARTICLE_SHADES), 1, PARTICLE_SHADES).astype(int)
+    palette = system.palette
+    batch = [(_get_particle_sprite(palette[color_id], shade), pos)
+             for color_id, shade, pos in zip(system.color_id[:n][visible].tolist(), shades.tolist(),
+                                             screen_pos[visible].tolist())]
+    for rect in screen.blits(batch):
+        mark_dirty(rect)
+
+# === Couche statique du niveau (tuiles) ===
+# Sol, plateformes et porte ne bougent pas: ils sont pré-rendus dans des tuiles
+# de STATIC_CHUNK_SIZE px du monde, construites à la première apparition à
+# l'écran et évincées (LRU) au-delà de STATIC_CHUNK_CACHE_MAX tuiles.
+STATIC_CHUNK_SIZE = 512
+STATIC_CHUNK_CACHE_MAX = 24
+STATIC_CHUNK_COLORKEY = (255, 0, 255)
+static_chunks = OrderedDict()
+static_empty_chunks = set()
+
+def reset_static_chunks():
+    static_chunks.clear()
+    static_empty_chunks.clear()
+
+def _draw_static_geometry(target, clip_rect):
+    # Dessine la géométrie fixe qui touche clip_rect (coordonnées monde) sur target
+    ox, oy = clip_rect.topleft
+    drawn = False
+    ground_y, ground_start_x, ground_end_x = world.ground_y, world.ground_start_x, world.ground_end_x
 
-level_enemy_configs = []
-current_monster_cap = MAX_MONSTERS
-monsters = []
-
-
-def _canonical_monster_type(raw_type):
-    if not raw_type:
-        return "basic"
-    t = str(raw_type).lower()
-    if t in MONSTER_TYPE_DEFAULTS:
-        return t
-    if t in ("walker", "ground"):
-        return "basic"
-    return "basic"
-
-
-def create_monster_from_config(config, template_id=None):
-    cfg = deepcopy(config)
-    m_type = _canonical_monster_type(cfg.get("type"))
-    defaults = MONSTER_TYPE_DEFAULTS[m_type]
-
-    x = float(cfg.get("x", 0))
-    y = float(cfg.get("y", 0))
-    width = cfg.get("w") or cfg.get("width")
-    height = cfg.get("h") or cfg.get("height")
-
-    radius = cfg.get("radius")
-    if radius is None:
-        if width and height:
-            radius = max(width, height) / 2
-        else:
-            radius = defaults["radius"]
-
-    speed = cfg.get("speed", defaults["speed"])
-    hp = int(cfg.get("hp", defaults["hp"]))
-    dir_val = cfg.get("dir", defaults["dir"])
-    direction = -1 if float(dir_val) < 0 else 1
-
-    monster = {
-        "pos": pygame.Vector2(x, y),
-        "dir": direction,
-        "type": m_type,
-        "radius": radius,
-        "speed": speed,
-        "hp": hp,
-        "hit_flash": 0.0,
-    }
-
-    if m_type == "flyer":
-        base_y = float(cfg.get("base_y", y))
-        monster.update({
-            "fly_phase": float(cfg.get("fly_phase", 0.0)),
-            "base_y": base_y,
-        })
-    else:
-        monster["vel_y"] = float(cfg.get("vel_y", 0.0))
+    # Sol avec texture
+    ground_world = pygame.Rect(ground_start_x, ground_y, ground_end_x - ground_start_x, 100)
+    if ground_world.colliderect(clip_rect):
+        ground_rect = ground_world.move(-ox, -oy)
+        pygame.draw.rect(target, GROUND_COLOR, ground_rect)
+        pygame.draw.rect(target, (25, 100, 25), ground_rect, 3)
+        stripe_left = max(ground_start_x, clip_rect.left - 2)
+        stripe_right = min(ground_end_x, clip_rect.right + 2)
+        first_stripe = ground_start_x + -(-(stripe_left - ground_start_x) // 50) * 50
+        for i in range(first_stripe, stripe_right, 50):
+            pygame.draw.line(target, (44, 160, 44), (i - ox, ground_y - oy), (i - ox, ground_y - oy + 100), 2)
+        drawn = True
 
-    if template_id is not None:
-        monster["template_id"] = template_id
+    # Plateformes avec relief
+    for plat in world.platforms:
+        if not plat.colliderect(clip_rect):
+            continue
+        plat_rect = plat.move(-ox, -oy)
+        pygame.draw.rect(target, PLATFORM_COLOR, plat_rect)
+        pygame.draw.rect(target, PLATFORM_HIGHLIGHT, plat_rect, 3)
+        pygame.draw.line(target, (80, 50, 20),
+                        (plat_rect.left, plat_rect.top + 5),
+                        (plat_rect.right, plat_rect.top + 5), 2)
+        drawn = True
 
-    return monster
+    # Porte avec détails
+    if world.goal_rect.colliderect(clip_rect):
+        door_rect = world.goal_rect.move(-ox, -oy)
+        pygame.draw.rect(target, DOOR_COLOR, door_rect)
+        pygame.draw.rect(target, DOOR_FRAME, door_rect, 5)
+        pygame.draw.line(target, (100, 70, 20),
+                        (door_rect.centerx, door_rect.top),
+                        (door_rect.centerx, door_rect.bottom), 3)
+        knob_pos = (door_rect.right - 12, door_rect.centery)
+        pygame.draw.circle(target, (30, 30, 30), knob_pos, 6)
+        pygame.draw.circle(target, (80, 80, 80), knob_pos, 3)
+        drawn = True
+    return drawn
+
+def _get_static_chunk(chunk_x, chunk_y):
+    key = (chunk_x, chunk_y)
+    chunk = static_chunks.get(key)
+    if chunk is not None:
+        static_chunks.move_to_end(key)
+        return chunk
+    if key in static_empty_chunks:
+        return None
+    size = STATIC_CHUNK_SIZE
+    # Géométrie opaque: une couleur clé (RLE) se blitte bien plus vite que l'alpha
+    chunk = pygame.Surface((size, size)).convert()
+    chunk.fill(STATIC_CHUNK_COLORKEY)
+    if not _draw_static_geometry(chunk, pygame.Rect(chunk_x * size, chunk_y * size, size, size)):
+        static_empty_chunks.add(key)
+        return None
+    chunk.set_colorkey(STATIC_CHUNK_COLORKEY, pygame.RLEACCEL)
+    static_chunks[key] = chunk
+    while len(static_chunks) > STATIC_CHUNK_CACHE_MAX:
+        static_chunks.popitem(last=False)
+    return chunk
+
+def draw_static_level(view_rect):
+    size = STATIC_CHUNK_SIZE
+    for chunk_y in range(view_rect.top // size, (view_rect.bottom - 1) // size + 1):
+        for chunk_x in range(view_rect.left // size, (view_rect.right - 1) // size + 1):
+            chunk = _get_static_chunk(chunk_x, chunk_y)
+            if chunk is not None:
+                screen.blit(chunk, (int(chunk_x * size - camera_offset.x), int(chunk_y * size - camera_offset.y)))
+
+def handle_world_events():
+    # Réagit aux changements d'état du monde (nouveau niveau, porte atteinte)
+    global selected_level_idx
+    for kind, level_idx in world.drain_events():
+        if kind == "level":
+            selected_level_idx = level_idx
+            reset_static_chunks()
+            select_tutorial_for_level(world.levels[level_idx])
+            if game_state == "PLAYING":
+                start_tutorial_display()
+        elif kind == "goal":
+            hide_tutorial_display()
+
+# === HUD (panneau composé une fois, recomposé seulement si l'état change) ===
+HUD_RECT = pygame.Rect(10, 10, 300, 210)
+HUD_STAMINA_BAR = pygame.Rect(20, 140, 240, 20)  # relatif au panneau
+hud_cache = {"key": None, "panel": None, "spawn": None, "spawn_rect": None}
+
+def _hud_state_key():
+    stamina_ratio = world.stamina / STAMINA_MAX if STAMINA_MAX else 0
+    fill_width = int(HUD_STAMINA_BAR.width * max(0, min(1, stamina_ratio)))
+    spawn_tenths = int(round(world.monster_spawn_timer * 10)) if world.monster_spawn_timer > 0 else None
+    return (world.score, world.lives, fill_width, world.is_invulnerable, spawn_tenths)
+
+def _compose_hud_panel(key):
+    score_value, lives_value, fill_width, invulnerable, _ = key
+    # Panneau semi-transparent
+    panel = pygame.Surface(HUD_RECT.size, pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 120))
 
+    blit_number_text(panel, font, "Score: ", str(score_value), (255, 255, 255), (20, 15))
 
-def instantiate_level_enemies():
-    global monsters, current_monster_cap, monster_spawn_timer
-    if level_enemy_configs:
-        monsters = []
-        for idx, cfg in enumerate(level_enemy_configs):
-            monsters.append(create_monster_from_config(cfg, template_id=idx))
-        current_monster_cap = len(level_enemy_configs)
-    else:
-        monsters = [spawn_monster() for _ in range(MAX_MONSTERS)]
-        current_monster_cap = MAX_MONSTERS
-    monster_spawn_timer = 0.0
-
-# === Multi-niveaux: chargement levels.json et application d'un niveau ===
-def _default_level():
-    return {
-        "name": "Niveau 1",
-        "ground": {"y": 0, "start_x": 0, "end_x": 10000},
-        "spawn": {"x": 40, "y": -40},
-        "goal": {"x": 1000, "y": -110, "w": 70, "h": 110},
-        "platforms": [],
-    }
-
-levels = []
-levels_dir = os.path.dirname(__file__)
-level_filenames = ["level.json", "levels.json"]  # support ancien et nouveau nommage
-for name in level_filenames:
-    level_path = os.path.join(levels_dir, name)
-    if not os.path.isfile(level_path):
-        continue
-    try:
-        with open(level_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, dict) and isinstance(data.get("levels"), list) and data["levels"]:
-                levels = data["levels"]
-                break
-    except Exception:
-        continue
+    # Vies avec cœurs
+    panel.blit(render_text(font, "Vies:", (255, 255, 255)), (20, 60))
+    for i in range(lives_value):
+        heart_x = 120 + i * 35
+        pygame.draw.circle(panel, (255, 50, 50), (heart_x - 5, 75), 10)
+        pygame.draw.circle(panel, (255, 50, 50), (heart_x + 5, 75), 10)
+        pygame.draw.polygon(panel, (255, 50, 50),
+                           [(heart_x - 15, 75), (heart_x, 90), (heart_x + 15, 75)])
+
+    panel.blit(render_text(small_font, "Stamina", (180, 200, 255)), (20, 110))
+    pygame.draw.rect(panel, (40, 40, 40), HUD_STAMINA_BAR, border_radius=6)
+    if fill_width > 0:
+        stamina_bar_fill = pygame.Rect(HUD_STAMINA_BAR.left, HUD_STAMINA_BAR.top, fill_width, HUD_STAMINA_BAR.height)
+        pygame.draw.rect(panel, (70, 170, 255), stamina_bar_fill, border_radius=6)
+    pygame.draw.rect(panel, (120, 180, 255), HUD_STAMINA_BAR, 2, border_radius=6)
 
-if not levels:
-    levels = [_default_level()]
-
-selected_level_idx = 0
-
-platforms = []
-goal_rect = pygame.Rect(0, 0, 0, 0)
-spawn_point = pygame.Vector2(0, 0)
-
-def apply_level(level):
-    global GROUND_Y, GROUND_START_X, GROUND_END_X, platforms, goal_rect, spawn_point, level_enemy_configs
-    # Sol
-    GROUND_Y = int(level.get("ground", {}).get("y", GROUND_Y))
-    GROUND_START_X = int(level.get("ground", {}).get("start_x", GROUND_START_X))
-    GROUND_END_X = int(level.get("ground", {}).get("end_x", GROUND_END_X))
-    # Plateformes
-    platforms = [
-        pygame.Rect(int(p.get("x", 0)), int(p.get("y", 0)), int(p.get("w", 0)), int(p.get("h", 0)))
-        for p in level.get("platforms", [])
-    ]
-    # Porte/objectif
-    g = level.get("goal", {})
-    goal_rect.x = int(g.get("x", 2300))
-    goal_rect.y = int(g.get("y", -30))
-    goal_rect.w = int(g.get("w", 70))
-    goal_rect.h = int(g.get("h", 110))
-    # Spawn
-    s = level.get("spawn", {})
-    spawn_point.update(float(s.get("x", SCREEN_WIDTH / 2)), float(s.get("y", GROUND_Y - (head_radius + body_height + leg_height))))
-    # Ennemis
-    level_enemy_configs = []
-    raw_enemies = level.get("enemies", [])
-    if isinstance(raw_enemies, list):
-        for entry in raw_enemies:
-            if isinstance(entry, dict):
-                level_enemy_configs.append(deepcopy(entry))
-    select_tutorial_for_level(level)
-
-# Appliquer le niveau initial
-apply_level(levels[selected_level_idx])
-instantiate_level_enemies()
-init_clouds()
+    if invulnerable:
+        panel.blit(render_text(small_font, "⚡ INVULNÉRABLE", (255, 255, 0)), (20, 170))
+    return panel
 
-# === Score, Vies, Victoire ===
-score = 0
-lives = 3
-invuln_time = 1.5
-invuln_timer = 0.0
-is_invulnerable = False
-victory = False
-
-LEVEL_TRANSITION_FADE_OUT = 0.6
-LEVEL_TRANSITION_FADE_IN = 0.6
-level_transition_active = False
-level_transition_phase = "fade_out"
-level_transition_timer = 0.0
-level_transition_next_idx = None
+def _compose_spawn_text(spawn_tenths):
+    # Indicateur de cooldown spawn
+    if spawn_tenths is None:
+        return None
+    glyphs = _number_text_glyphs(small_font, "Prochain spawn: ", f"{spawn_tenths / 10:.1f}", (200, 200, 200), "s")
+    surf = pygame.Surface((sum(g.get_width() for g in glyphs), max(g.get_height() for g in glyphs)), pygame.SRCALPHA)
+    x = 0
+    for glyph in glyphs:
+        surf.blit(glyph, (x, 0))
+        x += glyph.get_width()
+    return surf
+
+def draw_hud():
+    key = _hud_state_key()
+    changed = key != hud_cache["key"]
+    if changed:
+        hud_cache["key"] = key
+        hud_cache["panel"] = _compose_hud_panel(key)
+        hud_cache["spawn"] = _compose_spawn_text(key[4])
+        mark_dirty(HUD_RECT)
+        mark_dirty(hud_cache["spawn_rect"])
+    screen.blit(hud_cache["panel"], HUD_RECT.topleft)
+    spawn_surf = hud_cache["spawn"]
+    hud_cache["spawn_rect"] = screen.blit(spawn_surf, (SCREEN_WIDTH - 350, 30)) if spawn_surf else None
+    if changed:
+        mark_dirty(hud_cache["spawn_rect"])
 
 # === Etat du jeu ===
 game_state = "MENU"  # MENU, PLAYING, PAUSED
 fword_timer = 0.0
 
+# Préparer le niveau initial et les caches de fond/tutoriel
+handle_world_events()
+build_cloud_sprites()
+init_clouds()
+precompute_tutorial_wrapping()
+
+# === Voiles plein écran pré-alloués ===
+# Un seul voile noir opaque par résolution, assombri via set_alpha (alpha de
+# surface, bien plus rapide qu'une surface SRCALPHA recréée à chaque frame).
+# La pause réutilise une copie figée de la dernière image de jeu.
+overlay_cache = {"size": None, "surface": None}
+pause_snapshot = None
+
+def draw_dim_overlay(alpha):
+    size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    if overlay_cache["size"] != size:
+        overlay_cache["surface"] = pygame.Surface(size).convert()
+        overlay_cache["surface"].fill((0, 0, 0))
+        overlay_cache["size"] = size
+    overlay = overlay_cache["surface"]
+    overlay.set_alpha(alpha)
+    screen.blit(overlay, (0, 0))
+
+def capture_pause_snapshot():
+    global pause_snapshot
+    pause_snapshot = screen.copy()
+
+# === Rendu par rectangles modifiés (optionnel) ===
+# Au lieu de flip() sur tout l'écran, on ne pousse que les zones qui ont changé
+# (entités, HUD, boutons survolés). Repli sur un flip complet quand la caméra
+# bouge, quand l'état du jeu change ou sur demande (request_full_redraw).
+DIRTY_RECT_RENDERING = True
+dirty_rects = []
+previous_dirty_rects = []
+full_redraw_needed = True
+last_presented_state = None
+last_presented_camera = None
+button_hover_states = {}
+
+def mark_dirty(rect):
+    if rect:
+        dirty_rects.append(pygame.Rect(rect))
+
+def request_full_redraw():
+    global full_redraw_needed
+    full_redraw_needed = True
+
+def needs_full_present():
+    if not DIRTY_RECT_RENDERING or full_redraw_needed:
+        return True
+    if game_state != last_presented_state:
+        return True
+    return (int(camera_offset.x), int(camera_offset.y)) != last_presented_camera
+
+def present_frame():
+    global dirty_rects, previous_dirty_rects, full_redraw_needed, last_presented_state, last_presented_camera
+    if needs_full_present():
+        pygame.display.flip()
+    else:
+        # Les anciennes positions doivent aussi être rafraîchies (effacement)
+        pygame.display.update(previous_dirty_rects + dirty_rects)
+    previous_dirty_rects = dirty_rects
+    dirty_rects = []
+    full_redraw_needed = False
+    last_presented_state = game_state
+    last_presented_camera = (int(camera_offset.x), int(camera_offset.y))
+
+# === Mode veille (MENU / PAUSE) ===
+# Au menu et en pause, la boucle attend les événements (pygame.event.wait) au
+# lieu de tourner à FPS: on ne redessine que sur une entrée (survol, touche...)
+# ou, au menu, pour animer les nuages à cadence réduite.
+IDLE_MODE = True
+MENU_ANIMATION_FPS = 10  # 0 = nuages figés, le menu dort jusqu'à la prochaine entrée
+IDLE_MAX_DT = 0.25
+
+def poll_events():
+    if not IDLE_MODE or game_state not in ("MENU", "PAUSED"):
+        return pygame.event.get()
+    if full_redraw_needed or game_state != last_presented_state:
+        # Première image de l'écran: pas d'attente
+        return pygame.event.get()
+    if game_state == "MENU" and MENU_ANIMATION_FPS > 0:
+        first = pygame.event.wait(max(1, int(1000 / MENU_ANIMATION_FPS)))
+    else:
+        first = pygame.event.wait()
+    events = [] if first.type == pygame.NOEVENT else [first]
+    events.extend(pygame.event.get())
+    return events
+
+def idle_frame_dt():
+    return min(clock.tick(FPS) / 1000, IDLE_MAX_DT)
+
+# === Simulation à pas fixe (voir moteur.py) ===
+# Le monde avance par pas de FIXED_DT; l'affichage interpole entre les deux
+# derniers pas (positions "prev_pos" -> "pos").
+MAX_FRAME_DT = 0.1  # au-delà, le jeu ralentit au lieu d'enchaîner les pas
+INTERP_SNAP_DISTANCE = 200  # saut plus grand (respawn, niveau): pas d'interpolation
+sim_accumulator = 0.0
+pending_shots = []  # clics de tir en attente du prochain pas (coordonnées monde)
+
+def interpolate(prev, current, alpha):
+    if prev.distance_squared_to(current) > INTERP_SNAP_DISTANCE ** 2:
+        return current
+    return prev.lerp(current, alpha)
+
+def interpolate_array(prev, current, alpha):
+    # interpolate() pour des tableaux de positions (N, 2)
+    delta = current - prev
+    out = prev + delta * alpha
+    snap = (delta * delta).sum(axis=1) > INTERP_SNAP_DISTANCE ** 2
+    out[snap] = current[snap]
+    return out
+
+# Enregistrement optionnel (--record): la dernière partie jouée est sauvegardée
+recorder = ReplayRecorder(args.record) if args.record else None
+
+def reset_frame_clock():
+    # Au passage en jeu: le temps passé au menu/en pause ne compte pas
+    global dt, sim_accumulator
+    clock.tick()
+    dt = 0
+    sim_accumulator = 0.0
+
+def start_game():
+    global game_state
+    # Nouvelle partie sur le niveau sélectionné
+    game_state = "PLAYING"
+    reset_frame_clock()
+    world.start(selected_level_idx)
+    if recorder:
+        recorder.begin(world)
+    handle_world_events()
+
+def resume_game():
+    global game_state
+    game_state = "PLAYING"
+    reset_frame_clock()
+
+def end_game():
+    global game_state
+    game_state = "MENU"
+    request_full_redraw()
+    if recorder:
+        recorder.save()
+
+def read_inputs(keys):
+    return Inputs(
+        left=bool(keys[pygame.K_q] or keys[pygame.K_LEFT]),
+        right=bool(keys[pygame.K_d] or keys[pygame.K_RIGHT]),
+        jump=bool(keys[pygame.K_SPACE]),
+        dash=bool(keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]),
+        shots=tuple(pending_shots),
+    )
+
 # === Boucle principale ===
 running = True
 dt = 0
@@ -628,18 +1085,21 @@ while running:
     pause_menu_rect = pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 + 70, 300, 70)
     pause_quit_rect = pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 + 160, 300, 70)
     # Événements
-    for event in pygame.event.get():
+    for event in poll_events():
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.VIDEOEXPOSE:
+            request_full_redraw()
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
             if game_state == "MENU":
                 running = False
             elif game_state == "PLAYING":
-                # Ouvrir le menu pause
+                # Ouvrir le menu pause (sur une copie figée de la scène)
+                capture_pause_snapshot()
                 game_state = "PAUSED"
             elif game_state == "PAUSED":
                 # Reprendre
-                game_state = "PLAYING"
+                resume_game()
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_o:
             # Easter egg: gros texte à l'écran
             fword_timer = 1.5
@@ -649,110 +1109,37 @@ while running:
                 continue
             if game_state == "MENU":
                 if play_rect.collidepoint(event.pos):
-                    # Reset et démarrage du jeu
-                    score = 0
-                    lives = 3
-                    invuln_timer = 0.0
-                    is_invulnerable = False
-                    victory = False
-                    level_transition_active = False
-                    level_transition_phase = "fade_out"
-                    level_transition_timer = 0.0
-                    level_transition_next_idx = None
-                    # Appliquer le niveau sélectionné au démarrage
-                    apply_level(levels[selected_level_idx])
-                    instantiate_level_enemies()
-                    player_pos = spawn_point.copy()
-                    player_vel_y = 0
-                    projectiles = []
-                    particles = []
-                    monster_spawn_timer = 0.0
-                    stamina = STAMINA_MAX
-                    stamina_idle_timer = 0.0
-                    stamina_regen_timer = 0.0
-                    air_jumps_left = 1
-                    jump_was_pressed = False
-                    dash_was_pressed = False
-                    dash_timer = 0.0
-                    dash_direction = 1
-                    game_state = "PLAYING"
-                    start_tutorial_display()
+                    start_game()
                 elif quit_rect.collidepoint(event.pos):
                     running = False
             elif game_state == "PAUSED":
                 if pause_resume_rect.collidepoint(event.pos):
-                    game_state = "PLAYING"
+                    resume_game()
                     start_tutorial_display()
                 elif pause_menu_rect.collidepoint(event.pos):
-                    game_state = "MENU"
+                    end_game()
                     hide_tutorial_display()
                 elif pause_quit_rect.collidepoint(event.pos):
                     running = False
             elif game_state == "PLAYING":
-                # Tir vers la souris
-                mouse_world_x = event.pos[0] + camera_offset.x
-                mouse_world_y = event.pos[1] + camera_offset.y
-                
-                dx = mouse_world_x - player_pos.x
-                dy = mouse_world_y - player_pos.y
-                distance = math.sqrt(dx**2 + dy**2)
-                
-                if distance > 0:
-                    dir_x = dx / distance
-                    dir_y = dy / distance
-                    
-                    proj_x = player_pos.x + dir_x * (head_radius + 10)
-                    proj_y = player_pos.y + dir_y * (head_radius + 10)
-                    
-                    projectiles.append({
-                        "pos": pygame.Vector2(proj_x, proj_y),
-                        "vel": pygame.Vector2(dir_x * PROJECTILE_SPEED, dir_y * PROJECTILE_SPEED)
-                    })
-                    # Animation de recul et effet visuel
-                    shoot_recoil = 0.12
-                    create_particles((proj_x, proj_y), (255, 230, 100), 6)
+                # Tir vers la souris (appliqué au prochain pas de simulation)
+                pending_shots.append((event.pos[0] + camera_offset.x, event.pos[1] + camera_offset.y))
         elif event.type == pygame.KEYDOWN and game_state == "PAUSED":
             if event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                game_state = "PLAYING"
+                resume_game()
             elif event.key == pygame.K_m:
-                game_state = "MENU"
+                end_game()
         elif event.type == pygame.KEYDOWN:
             if game_state == "MENU" and event.key in (pygame.K_RETURN, pygame.K_SPACE):
                 # Lancer le jeu via clavier
-                score = 0
-                lives = 3
-                invuln_timer = 0.0
-                is_invulnerable = False
-                victory = False
-                level_transition_active = False
-                level_transition_phase = "fade_out"
-                level_transition_timer = 0.0
-                level_transition_next_idx = None
-                # Appliquer le niveau sélectionné au démarrage
-                apply_level(levels[selected_level_idx])
-                instantiate_level_enemies()
-                player_pos = spawn_point.copy()
-                player_vel_y = 0
-                game_state = "PLAYING"
-                projectiles = []
-                particles = []
-                monster_spawn_timer = 0.0
-                stamina = STAMINA_MAX
-                stamina_idle_timer = 0.0
-                jump_was_pressed = False
-                dash_was_pressed = False
-                dash_timer = 0.0
-                dash_direction = 1
-                game_state = "PLAYING"
-                start_tutorial_display()
+                start_game()
             elif game_state == "MENU" and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
                 # Changer de niveau sélectionné dans le menu
                 if event.key == pygame.K_LEFT:
-                    selected_level_idx = (selected_level_idx - 1) % len(levels)
+                    selected_level_idx = (selected_level_idx - 1) % len(world.levels)
                 else:
-                    selected_level_idx = (selected_level_idx + 1) % len(levels)
-                # Pré-appliquer pour que spawn/sol soient prêts au lancement
-                apply_level(levels[selected_level_idx])
+                    selected_level_idx = (selected_level_idx + 1) % len(world.levels)
+                request_full_redraw()
 
     # --- MENU PRINCIPAL ---
     if game_state == "MENU":
@@ -761,432 +1148,133 @@ while running:
         draw_parallax_background()
 
         # Titre
-        title_surf = title_font.render("Mon Jeu", True, (255, 255, 255))
+        title_surf = render_text(title_font, "Mon Jeu", (255, 255, 255))
         screen.blit(title_surf, (SCREEN_WIDTH//2 - title_surf.get_width()//2, SCREEN_HEIGHT//2 - 120))
 
         # Boutons
         mouse_pos = pygame.mouse.get_pos()
         def draw_button(rect, text):
             hovered = rect.collidepoint(mouse_pos)
+            if button_hover_states.get(text) != hovered:
+                button_hover_states[text] = hovered
+                mark_dirty(rect)
             base = (50, 50, 50)
             hover = (80, 80, 80)
             pygame.draw.rect(screen, hover if hovered else base, rect, border_radius=10)
             pygame.draw.rect(screen, (200, 200, 200), rect, 3, border_radius=10)
-            txt = font.render(text, True, (255, 255, 255))
+            txt = render_text(font, text, (255, 255, 255))
             screen.blit(txt, (rect.centerx - txt.get_width()//2, rect.centery - txt.get_height()//2))
 
         # Afficher le niveau sélectionné
-        level_name = levels[selected_level_idx].get("name", f"Niveau {selected_level_idx+1}")
-        level_txt = small_font.render(f"Niveau: {level_name}", True, (255, 255, 255))
+        level_name = world.levels[selected_level_idx].get("name", f"Niveau {selected_level_idx+1}")
+        level_txt = render_text(small_font, f"Niveau: {level_name}", (255, 255, 255))
         screen.blit(level_txt, (SCREEN_WIDTH//2 - level_txt.get_width()//2, SCREEN_HEIGHT//2 - 60))
 
         draw_button(play_rect, "Jouer")
         draw_button(quit_rect, "Quitter")
 
-        hint = small_font.render("Entrée/Espace pour jouer", True, (230, 230, 230))
+        hint = render_text(small_font, "Entrée/Espace pour jouer", (230, 230, 230))
         screen.blit(hint, (SCREEN_WIDTH//2 - hint.get_width()//2, SCREEN_HEIGHT//2 + 220))
 
-        pygame.display.flip()
-        dt = clock.tick(FPS) / 1000
+        present_frame()
+        dt = idle_frame_dt()
         continue
 
     # --- MENU PAUSE ---
     if game_state == "PAUSED":
-        # Fond atténué
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
-
-        # Titre
-        pause_title = title_font.render("Pause", True, (255, 255, 255))
-        screen.blit(pause_title, (SCREEN_WIDTH//2 - pause_title.get_width()//2, SCREEN_HEIGHT//2 - 120))
+        # Fond: scène figée + voile (2 blits). En mode rectangles modifiés, il
+        # n'est redessiné qu'au besoin; sinon seuls les boutons survolés changent.
+        pause_full_frame = needs_full_present()
+        if pause_full_frame:
+            if pause_snapshot is not None:
+                screen.blit(pause_snapshot, (0, 0))
+            draw_dim_overlay(180)
+
+            # Titre
+            pause_title = render_text(title_font, "Pause", (255, 255, 255))
+            screen.blit(pause_title, (SCREEN_WIDTH//2 - pause_title.get_width()//2, SCREEN_HEIGHT//2 - 120))
 
         mouse_pos = pygame.mouse.get_pos()
         def draw_button(rect, text):
             hovered = rect.collidepoint(mouse_pos)
+            if button_hover_states.get(text) != hovered:
+                button_hover_states[text] = hovered
+                mark_dirty(rect)
             base = (50, 50, 50)
             hover = (80, 80, 80)
             pygame.draw.rect(screen, hover if hovered else base, rect, border_radius=10)
             pygame.draw.rect(screen, (200, 200, 200), rect, 3, border_radius=10)
-            txt = font.render(text, True, (255, 255, 255))
+            txt = render_text(font, text, (255, 255, 255))
             screen.blit(txt, (rect.centerx - txt.get_width()//2, rect.centery - txt.get_height()//2))
 
         draw_button(pause_resume_rect, "Reprendre")
         draw_button(pause_menu_rect, "Menu")
         draw_button(pause_quit_rect, "Quitter")
 
-        hint = small_font.render("Echap/Entrée/Espace: Reprendre | M: Menu", True, (230, 230, 230))
-        screen.blit(hint, (SCREEN_WIDTH//2 - hint.get_width()//2, SCREEN_HEIGHT//2 + 250))
+        if pause_full_frame:
+            hint = render_text(small_font, "Echap/Entrée/Espace: Reprendre | M: Menu", (230, 230, 230))
+            screen.blit(hint, (SCREEN_WIDTH//2 - hint.get_width()//2, SCREEN_HEIGHT//2 + 250))
 
-        pygame.display.flip()
-        dt = clock.tick(FPS) / 1000
+        present_frame()
+        dt = idle_frame_dt()
         continue
 
-    # --- LOGIQUE DU JEU ---
-
-    # Mouvements
-    stamina_idle_timer += dt
+    # --- LOGIQUE DU JEU (pas fixes) ---
     keys = pygame.key.get_pressed()
-    moving = False
-    if keys[pygame.K_q] or keys[pygame.K_LEFT]:
-        player_pos.x -= MOVE_SPEED * dt
-        direction = -1
-        moving = True
-    if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-        player_pos.x += MOVE_SPEED * dt
-        direction = 1
-        moving = True
-    if moving:
-        walk_cycle += 10 * dt
-    else:
-        walk_cycle = 0
-
-    # Détection sol/plateforme
-    feet_y = player_pos.y + head_radius + body_height + leg_height
-    on_ground = False
-    # Sol infini limité en X
-    if feet_y >= GROUND_Y - 0.1 and GROUND_START_X <= player_pos.x <= GROUND_END_X:
-        on_ground = True
-    else:
-        for plat in platforms:
-            if plat.left - 5 < player_pos.x < plat.right + 5 and abs(feet_y - plat.top) <= 6:
-                on_ground = True
-                player_pos.y = plat.top - (head_radius + body_height + leg_height)
-                player_vel_y = 0
-                break
-
-    if on_ground:
-        air_jumps_left = 1
-
-    space_pressed = keys[pygame.K_SPACE]
-    if space_pressed and not jump_was_pressed:
-        if on_ground and stamina >= STAMINA_JUMP_COST:
-            player_vel_y = JUMP_FORCE
-            stamina = max(0, stamina - STAMINA_JUMP_COST)
-            stamina_idle_timer = 0.0
-            stamina_regen_timer = 0.0
-            air_jumps_left = 1
-        elif not on_ground and air_jumps_left > 0 and stamina >= DOUBLE_JUMP_COST:
-            player_vel_y = JUMP_FORCE
-            stamina = max(0, stamina - DOUBLE_JUMP_COST)
-            stamina_idle_timer = 0.0
-            stamina_regen_timer = 0.0
-            air_jumps_left -= 1
-
-    dash_pressed = keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
-    if dash_pressed and not dash_was_pressed and dash_timer <= 0 and stamina >= DASH_COST:
-        desired_dir = 0
-        if keys[pygame.K_q] or keys[pygame.K_LEFT]:
-            desired_dir = -1
-        elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            desired_dir = 1
-        else:
-            desired_dir = direction
-        if desired_dir != 0:
-            dash_direction = desired_dir
-            dash_timer = DASH_DURATION
-            stamina = max(0, stamina - DASH_COST)
-            stamina_idle_timer = 0.0
-            stamina_regen_timer = 0.0
-
-    jump_was_pressed = space_pressed
-    dash_was_pressed = dash_pressed
-
-    player_vel_y += GRAVITY * dt
-    player_pos.y += player_vel_y * dt
-
-    feet_y = player_pos.y + head_radius + body_height + leg_height
-    if feet_y > GROUND_Y and GROUND_START_X <= player_pos.x <= GROUND_END_X:
-        player_pos.y = GROUND_Y - (head_radius + body_height + leg_height)
-        player_vel_y = 0
-
-    player_rect = pygame.Rect(int(player_pos.x - head_radius), int(player_pos.y - head_radius), 
-                              head_radius*2, head_radius*2 + body_height + leg_height)
-    if player_vel_y >= 0:
-        for plat in platforms:
-            if player_rect.colliderect(plat):
-                plat_top = plat.top
-                if feet_y - player_vel_y * dt <= plat_top:
-                    player_pos.y = plat_top - (head_radius + body_height + leg_height)
-                    player_vel_y = 0
-                    break
-
-    if dash_timer > 0:
-        player_pos.x += dash_direction * DASH_SPEED * dt
-        dash_timer = max(0.0, dash_timer - dt)
-
-    player_pos.x = max(head_radius, player_pos.x)
-
-    if stamina_idle_timer >= STAMINA_REGEN_DELAY and stamina < STAMINA_MAX:
-        stamina_regen_timer += dt
-        while stamina_regen_timer >= STAMINA_REGEN_INTERVAL and stamina < STAMINA_MAX:
-            stamina = min(STAMINA_MAX, stamina + STAMINA_REGEN_AMOUNT)
-            stamina_regen_timer -= STAMINA_REGEN_INTERVAL
-        if stamina >= STAMINA_MAX:
-            stamina_regen_timer = 0.0
-    else:
-        stamina_regen_timer = 0.0
-
-    if not prev_on_ground and on_ground and player_vel_y == 0:
-        feet_x = player_pos.x
-        feet_y = GROUND_Y if feet_y >= GROUND_Y else player_pos.y + head_radius + body_height + leg_height
-        create_particles((feet_x, feet_y), (180, 180, 180), 10)
-    prev_on_ground = on_ground
-
-    blink_timer -= dt
-    if blink_timer <= 0 and blink_close <= 0:
-        blink_close = 0.12
-        blink_timer = random.uniform(2.0, 5.0)
-    if blink_close > 0:
-        blink_close -= dt
-    if shoot_recoil > 0:
-        shoot_recoil -= dt
-
-    if player_pos.y > DEATH_BELOW_Y:
-        lives -= 1
-        is_invulnerable = True
-        invuln_timer = invuln_time
-        player_pos = spawn_point.copy()
-        player_vel_y = 0
-        create_particles(player_pos, (255, 100, 100), 15)
-
-    # Caméra
-    target_x = player_pos.x - SCREEN_WIDTH // 2
-    target_y = player_pos.y - SCREEN_HEIGHT // 2
-    camera_offset.x += (target_x - camera_offset.x) * CAMERA_LAG
-    camera_offset.y += (target_y - camera_offset.y) * CAMERA_LAG
-
-    # Projectiles avec direction
-    for proj in projectiles[:]:
-        proj["pos"] += proj["vel"] * dt
-        if (proj["pos"].x < camera_offset.x - 200 or proj["pos"].x > camera_offset.x + SCREEN_WIDTH + 200 or
-            proj["pos"].y < camera_offset.y - 200 or proj["pos"].y > camera_offset.y + SCREEN_HEIGHT + 200):
-            projectiles.remove(proj)
-
-    # Collision projectile-monstre
-    for proj in projectiles[:]:
-        for monster in monsters[:]:
-            if proj["pos"].distance_to(monster["pos"]) < projectile_radius + monster["radius"]:
-                monster["hp"] -= 1
-                monster["hit_flash"] = 0.2
-                
-                if monster["hp"] <= 0:
-                    create_particles(monster["pos"], (255, 50, 50), 12)
-                    monsters.remove(monster)
-                    score += 2 if monster["type"] == "tank" else 1
-                
-                if proj in projectiles:
-                    projectiles.remove(proj)
-                break
-
-    # Spawn avec cooldown
-    monster_spawn_timer -= dt
-    if monster_spawn_timer <= 0:
-        spawned = False
-        if level_enemy_configs:
-            active_ids = {m.get("template_id") for m in monsters if m.get("template_id") is not None}
-            next_id = None
-            for idx in range(len(level_enemy_configs)):
-                if idx not in active_ids:
-                    next_id = idx
-                    break
-            if next_id is not None:
-                monsters.append(create_monster_from_config(level_enemy_configs[next_id], template_id=next_id))
-                spawned = True
-        else:
-            if len(monsters) < MAX_MONSTERS:
-                monsters.append(spawn_monster())
-                spawned = True
-        if spawned:
-            monster_spawn_timer = MONSTER_SPAWN_COOLDOWN
-
-    # Monstres (mouvement, gravité/vol et flash)
-    for monster in monsters:
-        # Horizontal
-        monster["pos"].x += monster["dir"] * monster["speed"] * dt
-        if monster["pos"].x < 50:
-            monster["dir"] = 1
-        if monster["pos"].x > 2500:
-            monster["dir"] = -1
-
-        if monster.get("type") == "flyer":
-            # Vol stationnaire/ondulant
-            monster["fly_phase"] += dt * 2.0
-            monster["pos"].y = monster["base_y"] + math.sin(monster["fly_phase"]) * 25
-        else:
-            # Gravité (marcheurs)
-            monster["vel_y"] += GRAVITY * dt
-            monster["pos"].y += monster["vel_y"] * dt
-
-            # Collision sol
-            feet_y = monster["pos"].y + monster["radius"]
-            if feet_y > GROUND_Y:
-                monster["pos"].y = GROUND_Y - monster["radius"]
-                monster["vel_y"] = 0
-
-            # Collision plateformes (atterrir par dessus)
-            if monster["vel_y"] >= 0:
-                monster_rect = pygame.Rect(int(monster["pos"].x - monster["radius"]),
-                                           int(monster["pos"].y - monster["radius"]),
-                                           monster["radius"]*2, monster["radius"]*2)
-                for plat in platforms:
-                    if monster_rect.colliderect(plat):
-                        plat_top = plat.top
-                        if feet_y - monster["vel_y"] * dt <= plat_top + 2:
-                            monster["pos"].y = plat_top - monster["radius"]
-                            monster["vel_y"] = 0
-                            break
-
-        # Flash dégâts
-        if monster["hit_flash"] > 0:
-            monster["hit_flash"] -= dt
-
-    # Collision joueur-ennemi
-    p_center = (int(player_pos.x), int(player_pos.y))
-    if not is_invulnerable:
-        for monster in monsters[:]:
-            if circle_rect_collision((monster["pos"].x, monster["pos"].y), monster["radius"], player_rect):
-                lives -= 1
-                is_invulnerable = True
-                invuln_timer = invuln_time
-                player_pos = spawn_point.copy()
-                player_vel_y = 0
-                create_particles(player_pos, (255, 255, 100), 15)
-                break
-
-    if is_invulnerable:
-        invuln_timer -= dt
-        if invuln_timer <= 0:
-            is_invulnerable = False
-
-    # Particules
-    for part in particles[:]:
-        part["pos"] += part["vel"] * dt
-        part["vel"].y += GRAVITY * 0.5 * dt
-        part["life"] -= dt * 2
-        if part["life"] <= 0:
-            particles.remove(part)
-
-    # Victoire
-    if (not victory and not level_transition_active and
-        pygame.Rect(int(player_pos.x - head_radius), int(player_pos.y - head_radius),
-                    head_radius*2, head_radius*2).colliderect(goal_rect)):
-        hide_tutorial_display()
-        if selected_level_idx < len(levels) - 1:
-            level_transition_active = True
-            level_transition_phase = "fade_out"
-            level_transition_timer = 0.0
-            level_transition_next_idx = selected_level_idx + 1
-        else:
-            victory = True
+    sim_accumulator += min(dt, MAX_FRAME_DT)
+    while sim_accumulator >= FIXED_DT:
+        inputs = read_inputs(keys)
+        if recorder:
+            recorder.record(inputs)
+        world.step(inputs, FIXED_DT)
+        pending_shots.clear()
+        sim_accumulator -= FIXED_DT
+    handle_world_events()
+    alpha = sim_accumulator / FIXED_DT
+
+    # Positions d'affichage interpolées entre les deux derniers pas
+    camera_offset.update(interpolate(world.camera_prev, world.camera, alpha))
+    render_player_pos = interpolate(world.player_prev_pos, world.player_pos, alpha)
 
     # --- DESSIN ---
 
-    # Ciel dégradé
-    for i in range(SCREEN_HEIGHT):
-        color = (
-            int(70 + (130 - 70) * i / SCREEN_HEIGHT),
-            int(130 + (180 - 130) * i / SCREEN_HEIGHT),
-            int(180 + (230 - 180) * i / SCREEN_HEIGHT)
-        )
-        pygame.draw.line(screen, color, (0, i), (SCREEN_WIDTH, i))
+    # Ciel dégradé (pré-calculé)
+    draw_sky()
 
-    # Sol avec texture
-    ground_rect = pygame.Rect(GROUND_START_X - camera_offset.x, GROUND_Y - camera_offset.y, GROUND_END_X - GROUND_START_X, 100)
-    pygame.draw.rect(screen, GROUND_COLOR, ground_rect)
-    pygame.draw.rect(screen, (25, 100, 25), ground_rect, 3)
-    for i in range(0, 3000, 50):
-        pygame.draw.line(screen, (44, 160, 44), 
-                        (i - camera_offset.x, GROUND_Y - camera_offset.y),
-                        (i - camera_offset.x, GROUND_Y - camera_offset.y + 100), 2)
+    # Culling: seul ce qui touche la zone visible est dessiné
+    view_rect = get_view_rect(margin=2)
 
-    # Plateformes avec relief
-    for plat in platforms:
-        plat_rect_screen = plat.move(-camera_offset.x, -camera_offset.y)
-        pygame.draw.rect(screen, PLATFORM_COLOR, plat_rect_screen)
-        pygame.draw.rect(screen, PLATFORM_HIGHLIGHT, plat_rect_screen, 3)
-        pygame.draw.line(screen, (80, 50, 20), 
-                        (plat_rect_screen.left, plat_rect_screen.top + 5),
-                        (plat_rect_screen.right, plat_rect_screen.top + 5), 2)
-
-    # Porte avec détails
-    goal_rect_screen = goal_rect.move(-camera_offset.x, -camera_offset.y)
-    pygame.draw.rect(screen, DOOR_COLOR, goal_rect_screen)
-    pygame.draw.rect(screen, DOOR_FRAME, goal_rect_screen, 5)
-    pygame.draw.line(screen, (100, 70, 20), 
-                    (goal_rect_screen.centerx, goal_rect_screen.top),
-                    (goal_rect_screen.centerx, goal_rect_screen.bottom), 3)
-    knob_pos = (goal_rect_screen.right - 12, goal_rect_screen.centery)
-    pygame.draw.circle(screen, (30, 30, 30), knob_pos, 6)
-    pygame.draw.circle(screen, (80, 80, 80), knob_pos, 3)
+    # Sol, plateformes et porte: tuiles pré-rendues qui touchent l'écran
+    draw_static_level(view_rect)
 
     # Ombres
-    player_feet = player_pos.y + head_radius + body_height + leg_height
-    draw_shadow(player_pos.x, player_feet, head_radius + 12)
-    for monster in monsters:
-        draw_shadow(monster["pos"].x, monster["pos"].y + monster["radius"], monster["radius"])
+    player_feet = render_player_pos.y + head_radius + body_height + leg_height
+    mark_dirty(draw_shadow(render_player_pos.x, player_feet, head_radius + 12))
+    monster_render_pos = [interpolate(monster.prev_pos, monster.pos, alpha) for monster in world.monsters]
+    for monster, monster_pos in zip(world.monsters, monster_render_pos):
+        mark_dirty(draw_shadow(monster_pos.x, monster_pos.y + monster.radius, monster.radius))
 
     # Joueur
-    p_center_screen = (int(player_pos.x - camera_offset.x), int(player_pos.y - camera_offset.y))
-    moving_now = keys[pygame.K_q] or keys[pygame.K_LEFT] or keys[pygame.K_d] or keys[pygame.K_RIGHT]
-    bob = math.sin(walk_cycle * 12) * 2 if moving_now else 0
+    p_center_screen = (int(render_player_pos.x - camera_offset.x), int(render_player_pos.y - camera_offset.y))
+    moving_now = world.moving
+    bob = math.sin(world.walk_cycle * 12) * 2 if moving_now else 0
     render_center = (p_center_screen[0], p_center_screen[1] + int(bob))
 
-    if not is_invulnerable or int(invuln_timer * 10) % 2 == 0:
-        # Tête avec contour
-        pygame.draw.circle(screen, skin_color, render_center, head_radius)
-        pygame.draw.circle(screen, (0, 0, 0), render_center, head_radius, 3)
-        
-        # Visage
-        eye_offset = 7
-        eye_pos = (render_center[0] - eye_offset * direction, render_center[1] - 5)
-        if blink_close > 0:
-            pygame.draw.line(screen, (0, 0, 0), (int(eye_pos[0]-3), int(eye_pos[1])), (int(eye_pos[0]+3), int(eye_pos[1])), 2)
-        else:
-            pygame.draw.circle(screen, (0, 0, 0), (int(eye_pos[0]), int(eye_pos[1])), 3)
-        pygame.draw.arc(screen, (0, 0, 0), 
-                       (render_center[0] - head_radius, render_center[1] - head_radius, 
-                        head_radius*2, head_radius*2), 3.8, 5.0, 3)
-
-        # Cou + Torse (rectangle arrondi comme un t-shirt)
-        neck_width = 10
-        neck_height = 6
-        neck_rect = pygame.Rect(render_center[0] - neck_width//2, render_center[1] + head_radius - 2, neck_width, neck_height)
-        pygame.draw.rect(screen, HAND_COLOR, neck_rect, border_radius=3)
-
-        torso_width = 26
-        tilt = direction * (2 if moving_now else 0)
-        torso_rect = pygame.Rect(0, 0, torso_width, body_height)
-        torso_rect.centerx = render_center[0] + int(tilt)
-        torso_rect.top = render_center[1] + head_radius
-        pygame.draw.rect(screen, SHIRT_COLOR, torso_rect, border_radius=6)
-        pygame.draw.rect(screen, (0, 0, 0), torso_rect, 2, border_radius=6)
-        body_start = (torso_rect.centerx, torso_rect.top)
-        body_end = (torso_rect.centerx, torso_rect.bottom)
-
-        # Bras (recul au tir et pose en l'air) plus épais avec mains
-        base_arm_y = render_center[1] + head_radius + 16
-        arm_y = base_arm_y - (6 if not on_ground else 0)
-        arm_angle = math.sin(walk_cycle * 10) * 15
-        arm_offset = arm_length * math.cos(math.radians(arm_angle))
-        if shoot_recoil > 0:
-            recoil_factor = 1.0 - min(1.0, shoot_recoil / 0.12) * 0.6
-            arm_offset *= recoil_factor
-            arm_y -= 2
-        if not on_ground:
-            arm_offset *= 0.6
-        left_hand = (int(render_center[0] - arm_offset), int(arm_y))
-        right_hand = (int(render_center[0] + arm_offset), int(arm_y))
-        pygame.draw.line(screen, (0, 0, 0), (left_hand[0], arm_y), (right_hand[0], arm_y), 6)
-        pygame.draw.circle(screen, HAND_COLOR, left_hand, 4)
-        pygame.draw.circle(screen, HAND_COLOR, right_hand, 4)
+    if not world.is_invulnerable or int(world.invuln_timer * 10) % 2 == 0:
+        # Corps pré-rendu (atlas), le bob est un simple décalage vertical
+        body_surf, (left_off, right_off) = get_player_frame(world.direction, world.blink_close > 0, moving_now,
+                                                            world.on_ground, world.walk_cycle, world.shoot_recoil)
+        mark_dirty(screen.blit(body_surf, (render_center[0] - PLAYER_ATLAS_CENTER[0],
+                                           render_center[1] - PLAYER_ATLAS_CENTER[1])))
+        left_hand = (render_center[0] + left_off[0], render_center[1] + left_off[1])
+        right_hand = (render_center[0] + right_off[0], render_center[1] + right_off[1])
 
         # Pistolet dans la main avant, orienté vers la souris
         mouse_x, mouse_y = pygame.mouse.get_pos()
         mouse_world = pygame.Vector2(mouse_x + camera_offset.x, mouse_y + camera_offset.y)
-        aim_vec = (mouse_world - pygame.Vector2(player_pos.x, player_pos.y))
+        aim_vec = (mouse_world - render_player_pos)
         if aim_vec.length_squared() == 0:
-            aim_dir = pygame.Vector2(direction, 0)
+            aim_dir = pygame.Vector2(world.direction, 0)
         else:
             aim_dir = aim_vec.normalize()
         # Choisir la main avant selon l'orientation de visée
@@ -1201,226 +1289,80 @@ while running:
         body_end = base + aim_dir * body_len
         barrel_end = body_end + aim_dir * barrel_len
         # Dessin
-        pygame.draw.line(screen, (20, 20, 20), base, grip_end, thickness)  # poignée
-        pygame.draw.line(screen, (30, 30, 30), base, body_end, thickness)  # corps
-        pygame.draw.line(screen, (80, 80, 80), body_end, barrel_end, 3)    # canon
+        mark_dirty(pygame.draw.line(screen, (20, 20, 20), base, grip_end, thickness))  # poignée
+        mark_dirty(pygame.draw.line(screen, (30, 30, 30), base, body_end, thickness))  # corps
+        mark_dirty(pygame.draw.line(screen, (80, 80, 80), body_end, barrel_end, 3))    # canon
 
         # (Jambes retirées)
 
-        # Cheveux simples
-        hair_rect = pygame.Rect(render_center[0] - head_radius + 4, render_center[1] - head_radius + 2, head_radius*2 - 8, head_radius)
-        pygame.draw.arc(screen, HAIR_COLOR, hair_rect, math.radians(200), math.radians(340), 4)
-
-    # Projectiles avec traînée
-    for proj in projectiles:
-        proj_screen = (int(proj["pos"].x - camera_offset.x), int(proj["pos"].y - camera_offset.y))
-        pygame.draw.circle(screen, (150, 255, 150), proj_screen, projectile_radius + 2)
+    # Projectiles avec traînée (interpolation et culling sur tout le pool d'un coup)
+    pool = world.projectiles
+    proj_margin = projectile_radius + 4
+    proj_screen_pos = (interpolate_array(pool.prev_pos[:pool.count], pool.positions(), alpha)
+                       - (camera_offset.x, camera_offset.y)).astype(int)
+    on_screen = ((proj_screen_pos[:, 0] >= -proj_margin) & (proj_screen_pos[:, 0] < SCREEN_WIDTH + proj_margin) &
+                 (proj_screen_pos[:, 1] >= -proj_margin) & (proj_screen_pos[:, 1] < SCREEN_HEIGHT + proj_margin))
+    for proj_screen in proj_screen_pos[on_screen].tolist():
+        mark_dirty(pygame.draw.circle(screen, (150, 255, 150), proj_screen, projectile_radius + 2))
         pygame.draw.circle(screen, (0, 255, 0), proj_screen, projectile_radius)
         pygame.draw.circle(screen, (255, 255, 255), proj_screen, projectile_radius - 3)
 
-    # Monstres (types: tank, fast, flyer)
-    for monster in monsters:
-        monster_screen = (int(monster["pos"].x - camera_offset.x), 
-                         int(monster["pos"].y - camera_offset.y))
-        r = monster["radius"]
-        
-        # Couleur selon flash
-        base_colors = {
-            "tank": (200, 40, 40),
-            "fast": (255, 140, 0),
-            "flyer": (100, 160, 255),
-        }
-        monster_color = (255, 220, 220) if monster["hit_flash"] > 0 else base_colors.get(monster["type"], (220, 20, 20))
-
-        if monster["type"] == "tank":
-            # Corps plus gros + contour
-            pygame.draw.circle(screen, monster_color, monster_screen, r)
-            pygame.draw.circle(screen, (0, 0, 0), monster_screen, r, 3)
-            # Sac à dos / blindage
-            backpack_x = monster_screen[0] - 18
-            backpack_y = monster_screen[1]
-            backpack_rect = pygame.Rect(backpack_x - 12, backpack_y - 18, 24, 36)
-            pygame.draw.rect(screen, (60, 40, 20), backpack_rect)
-            pygame.draw.rect(screen, (0, 0, 0), backpack_rect, 2)
-            pygame.draw.circle(screen, (100, 80, 50), (backpack_x, backpack_y - 6), 5)
-            # Yeux
-            pygame.draw.circle(screen, (255, 255, 0), (monster_screen[0] - 9, monster_screen[1] - 6), 4)
-            pygame.draw.circle(screen, (255, 255, 0), (monster_screen[0] + 9, monster_screen[1] - 6), 4)
-            pygame.draw.circle(screen, (0, 0, 0), (monster_screen[0] - 9, monster_screen[1] - 6), 2)
-            pygame.draw.circle(screen, (0, 0, 0), (monster_screen[0] + 9, monster_screen[1] - 6), 2)
-        elif monster["type"] == "fast":
-            # Petit rapide
-            pygame.draw.circle(screen, monster_color, monster_screen, r)
-            pygame.draw.circle(screen, (0, 0, 0), monster_screen, r, 3)
-            # Yeux plus rapprochés
-            pygame.draw.circle(screen, (0, 0, 0), (monster_screen[0] - 6, monster_screen[1] - 4), 3)
-            pygame.draw.circle(screen, (0, 0, 0), (monster_screen[0] + 6, monster_screen[1] - 4), 3)
-            # Traînée légère
-            pygame.draw.circle(screen, (255, 200, 120), (monster_screen[0] - monster["dir"]*r, monster_screen[1]), max(1, r//4))
-        else:  # flyer
-            # Corps volant avec ailes
-            pygame.draw.circle(screen, monster_color, monster_screen, r)
-            pygame.draw.circle(screen, (0, 0, 0), monster_screen, r, 3)
-            wing_span = r + 10
-            left_wing = [(monster_screen[0] - 2, monster_screen[1]),
-                         (monster_screen[0] - wing_span, monster_screen[1] - 6),
-                         (monster_screen[0] - wing_span + 6, monster_screen[1] + 6)]
-            right_wing = [(monster_screen[0] + 2, monster_screen[1]),
-                          (monster_screen[0] + wing_span, monster_screen[1] - 6),
-                          (monster_screen[0] + wing_span - 6, monster_screen[1] + 6)]
-            pygame.draw.polygon(screen, (180, 210, 255), left_wing)
-            pygame.draw.polygon(screen, (180, 210, 255), right_wing)
-            pygame.draw.polygon(screen, (0, 0, 0), left_wing, 2)
-            pygame.draw.polygon(screen, (0, 0, 0), right_wing, 2)
-
-    # Particules
-    for part in particles:
-        if part["life"] > 0:
-            part_screen = (int(part["pos"].x - camera_offset.x), int(part["pos"].y - camera_offset.y))
-            alpha = int(255 * part["life"])
-            color = tuple(min(255, max(0, int(c * part["life"]))) for c in part["color"])
-            pygame.draw.circle(screen, color, part_screen, 3)
-
-    # --- HUD ---
-    # Panneau semi-transparent
-    hud_panel = pygame.Surface((300, 210), pygame.SRCALPHA)
-    hud_panel.fill((0, 0, 0, 120))
-    screen.blit(hud_panel, (10, 10))
+    # Monstres (types: tank, fast, flyer) - sprites pré-rendus
+    for monster, monster_pos in zip(world.monsters, monster_render_pos):
+        sprite = get_monster_sprite(monster.type, monster.radius, monster.hit_flash > 0, monster.dir)
+        half = sprite.get_width() // 2
+        if not view_rect.inflate(half * 2, half * 2).collidepoint(monster_pos):
+            continue
+        mark_dirty(screen.blit(sprite, (int(monster_pos.x - camera_offset.x) - half,
+                                        int(monster_pos.y - camera_offset.y) - half)))
 
-    score_text = font.render(f"Score: {score}", True, (255, 255, 255))
-    screen.blit(score_text, (30, 25))
-    
-    # Vies avec cœurs
-    lives_text = font.render("Vies:", True, (255, 255, 255))
-    screen.blit(lives_text, (30, 70))
-    for i in range(lives):
-        heart_x = 130 + i * 35
-        pygame.draw.circle(screen, (255, 50, 50), (heart_x - 5, 85), 10)
-        pygame.draw.circle(screen, (255, 50, 50), (heart_x + 5, 85), 10)
-        pygame.draw.polygon(screen, (255, 50, 50), 
-                           [(heart_x - 15, 85), (heart_x, 100), (heart_x + 15, 85)])
-
-    stamina_label = small_font.render("Stamina", True, (180, 200, 255))
-    screen.blit(stamina_label, (30, 120))
-    stamina_bar_bg = pygame.Rect(30, 150, 240, 20)
-    pygame.draw.rect(screen, (40, 40, 40), stamina_bar_bg, border_radius=6)
-    stamina_ratio = stamina / STAMINA_MAX if STAMINA_MAX else 0
-    fill_width = int(stamina_bar_bg.width * max(0, min(1, stamina_ratio)))
-    if fill_width > 0:
-        stamina_bar_fill = pygame.Rect(stamina_bar_bg.left, stamina_bar_bg.top, fill_width, stamina_bar_bg.height)
-        pygame.draw.rect(screen, (70, 170, 255), stamina_bar_fill, border_radius=6)
-    pygame.draw.rect(screen, (120, 180, 255), stamina_bar_bg, 2, border_radius=6)
+    # Particules (cosmétiques: dernier pas simulé, sans interpolation)
+    draw_particles()
 
-    if is_invulnerable:
-        inv_text = small_font.render("⚡ INVULNÉRABLE", True, (255, 255, 0))
-        screen.blit(inv_text, (30, 180))
+    # --- HUD ---
+    draw_hud()
 
-    # Indicateur de cooldown spawn
-    if monster_spawn_timer > 0:
-        cooldown_text = small_font.render(f"Prochain spawn: {monster_spawn_timer:.1f}s", 
-                                         True, (200, 200, 200))
-        screen.blit(cooldown_text, (SCREEN_WIDTH - 350, 30))
-
-    if level_transition_active:
-        level_transition_timer += dt
-        overlay_alpha = 0
-        if level_transition_phase == "fade_out":
-            if LEVEL_TRANSITION_FADE_OUT > 0:
-                overlay_alpha = min(255, int((level_transition_timer / LEVEL_TRANSITION_FADE_OUT) * 255))
-            else:
-                overlay_alpha = 255
-            if level_transition_timer >= LEVEL_TRANSITION_FADE_OUT:
-                selected_level_idx = level_transition_next_idx
-                apply_level(levels[selected_level_idx])
-                instantiate_level_enemies()
-                player_pos = spawn_point.copy()
-                player_vel_y = 0
-                projectiles = []
-                particles = []
-                monster_spawn_timer = 0.0
-                stamina = STAMINA_MAX
-                stamina_idle_timer = 0.0
-                stamina_regen_timer = 0.0
-                air_jumps_left = 1
-                jump_was_pressed = False
-                dash_was_pressed = False
-                dash_timer = 0.0
-                dash_direction = 1
-                shoot_recoil = 0.0
-                prev_on_ground = True
-                is_invulnerable = False
-                invuln_timer = 0.0
-                camera_offset.x = player_pos.x - SCREEN_WIDTH // 2
-                camera_offset.y = player_pos.y - SCREEN_HEIGHT // 2
-                start_tutorial_display()
-                level_transition_phase = "fade_in"
-                level_transition_timer = 0.0
-                overlay_alpha = 255
-        else:
-            if LEVEL_TRANSITION_FADE_IN > 0:
-                overlay_alpha = max(0, 255 - int((level_transition_timer / LEVEL_TRANSITION_FADE_IN) * 255))
-            else:
-                overlay_alpha = 0
-            if level_transition_timer >= LEVEL_TRANSITION_FADE_IN:
-                level_transition_active = False
-                level_transition_next_idx = None
-                level_transition_phase = "fade_out"
-                level_transition_timer = 0.0
-                overlay_alpha = 0
+    if world.level_transition_active:
+        request_full_redraw()
+        overlay_alpha = world.transition_alpha()
         if overlay_alpha > 0:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, overlay_alpha))
-            screen.blit(overlay, (0, 0))
-
-    # Messages de fin
-    if victory:
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+            draw_dim_overlay(overlay_alpha)
+
+    # Messages de fin (le monde est réinitialisé au prochain "Jouer")
+    if world.victory:
+        draw_dim_overlay(180)
         
-        big_text = pygame.font.SysFont(None, 120).render("VICTOIRE !", True, (255, 215, 0))
-        sub_text = font.render("Félicitations !", True, (255, 255, 255))
-        score_final = font.render(f"Score Final: {score}", True, (255, 255, 255))
+        big_text = render_text(victory_font, "VICTOIRE !", (255, 215, 0))
+        sub_text = render_text(font, "Félicitations !", (255, 255, 255))
         
         screen.blit(big_text, (SCREEN_WIDTH//2 - big_text.get_width()//2, SCREEN_HEIGHT//2 - 100))
         screen.blit(sub_text, (SCREEN_WIDTH//2 - sub_text.get_width()//2, SCREEN_HEIGHT//2 + 20))
-        screen.blit(score_final, (SCREEN_WIDTH//2 - score_final.get_width()//2, SCREEN_HEIGHT//2 + 70))
+        blit_number_text(screen, font, "Score Final: ", str(world.score), (255, 255, 255),
+                         (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70), centered=True)
         pygame.display.flip()
         pygame.time.delay(1500)
-        # Retour au menu
-        game_state = "MENU"
-        victory = False
-        level_transition_active = False
-        level_transition_next_idx = None
-        level_transition_phase = "fade_out"
-        level_transition_timer = 0.0
-
-    if lives <= 0:
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
+        # Retour au menu (déjà affiché: le menu repart d'un flip complet)
+        end_game()
+        continue
+
+    elif world.game_over:
+        draw_dim_overlay(200)
         
-        over_text = pygame.font.SysFont(None, 96).render("GAME OVER", True, (255, 50, 50))
-        score_final = font.render(f"Score: {score}", True, (255, 255, 255))
+        over_text = render_text(title_font, "GAME OVER", (255, 50, 50))
         
         screen.blit(over_text, (SCREEN_WIDTH//2 - over_text.get_width()//2, SCREEN_HEIGHT//2 - 60))
-        screen.blit(score_final, (SCREEN_WIDTH//2 - score_final.get_width()//2, SCREEN_HEIGHT//2 + 20))
+        blit_number_text(screen, font, "Score: ", str(world.score), (255, 255, 255),
+                         (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 20), centered=True)
         pygame.display.flip()
         pygame.time.delay(1500)
-        # Retour au menu
-        game_state = "MENU"
-        # Reset léger, le plein reset se fera quand on clique "Jouer"
-        lives = 3
-        score = 0
-        projectiles = []
-        particles = []
-        level_transition_active = False
-        level_transition_next_idx = None
-        level_transition_phase = "fade_out"
-        level_transition_timer = 0.0
+        # Retour au menu (déjà affiché: le menu repart d'un flip complet)
+        end_game()
+        continue
 
     draw_tutorial_overlay()
-    pygame.display.flip()
+    present_frame()
     dt = clock.tick(FPS) / 1000
 
+if recorder and game_state != "MENU":
+    recorder.save()  # partie en cours au moment de quitter
 pygame.quit()
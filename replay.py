@@ -0,0 +1,186 @@
+# === Enregistrement et relecture des parties ===
+# Une partie est entièrement déterminée par sa graine, son niveau de départ et
+# les entrées de chaque pas fixe (voir moteur.py). Le fichier ne contient donc
+# que ces entrées, compressées par plages de pas identiques, puis l'état final
+# attendu. La relecture se fait sans fenêtre, aussi vite que le CPU le permet:
+#
+#     python replay.py partie.rep
+#
+# Format (little-endian):
+#   en-tête   magic "JREP", version, graine, niveau, largeur/hauteur de vue, SIM_HZ
+#   plages    (touches, nombre de pas); si TIR: un seul pas, nombre de tirs,
+#             puis les cibles (x, y) en float64 (coordonnées monde exactes)
+#   fin       plage vide (touches=0xFF), puis pas, score, vies, niveau, x, y du joueur
+import struct
+import sys
+import time
+
+from moteur import World, Inputs, SIM_HZ, FIXED_DT
+
+REPLAY_MAGIC = b"JREP"
+REPLAY_VERSION = 1
+HEADER = struct.Struct("<4sBIHHHH")
+RUN = struct.Struct("<BH")
+SHOT_COUNT = struct.Struct("<B")
+SHOT = struct.Struct("<dd")
+FOOTER = struct.Struct("<IiiHdd")
+
+KEY_LEFT = 1
+KEY_RIGHT = 2
+KEY_JUMP = 4
+KEY_DASH = 8
+KEY_SHOTS = 16
+END_OF_RUNS = 0xFF
+MAX_RUN = 0xFFFF
+
+
+class ReplayError(Exception):
+    pass
+
+
+def _input_bits(inputs):
+    bits = 0
+    if inputs.left:
+        bits |= KEY_LEFT
+    if inputs.right:
+        bits |= KEY_RIGHT
+    if inputs.jump:
+        bits |= KEY_JUMP
+    if inputs.dash:
+        bits |= KEY_DASH
+    return bits
+
+
+def _end_state(world, ticks):
+    return (ticks, world.score, world.lives, world.level_idx, world.player_pos.x, world.player_pos.y)
+
+
+class ReplayRecorder:
+    """Enregistre les entrées d'une partie, du world.start() à save()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.world = None
+        self.runs = []
+        self.ticks = 0
+
+    def begin(self, world):
+        self.world = world
+        self.seed = world.seed
+        self.level_idx = world.level_idx
+        self.runs = []
+        self.ticks = 0
+
+    def record(self, inputs):
+        if self.world is None:
+            return
+        bits = _input_bits(inputs)
+        if inputs.shots:
+            self.runs.append([bits | KEY_SHOTS, 1, tuple(inputs.shots)])
+        elif self.runs and self.runs[-1][0] == bits and self.runs[-1][1] < MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([bits, 1, ()])
+        self.ticks += 1
+
+    def save(self):
+        if self.world is None:
+            return
+        chunks = [HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.level_idx,
+                              self.world.view_width, self.world.view_height, SIM_HZ)]
+        for bits, count, shots in self.runs:
+            chunks.append(RUN.pack(bits, count))
+            if shots:
+                chunks.append(SHOT_COUNT.pack(len(shots)))
+                chunks.extend(SHOT.pack(x, y) for x, y in shots)
+        chunks.append(RUN.pack(END_OF_RUNS, 0))
+        chunks.append(FOOTER.pack(*_end_state(self.world, self.ticks)))
+        with open(self.path, "wb") as f:
+            f.write(b"".join(chunks))
+        self.world = None
+
+
+def load_replay(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        magic, version, seed, level_idx, view_w, view_h, sim_hz = HEADER.unpack_from(data, 0)
+    except struct.error:
+        raise ReplayError(f"{path}: fichier trop court")
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ReplayError(f"{path}: pas un enregistrement (version {REPLAY_VERSION}) du jeu")
+    if sim_hz != SIM_HZ:
+        raise ReplayError(f"{path}: enregistré à {sim_hz} Hz, le moteur tourne à {SIM_HZ} Hz")
+
+    runs = []
+    offset = HEADER.size
+    try:
+        while True:
+            bits, count = RUN.unpack_from(data, offset)
+            offset += RUN.size
+            if bits == END_OF_RUNS:
+                break
+            shots = ()
+            if bits & KEY_SHOTS:
+                if count != 1:
+                    raise ReplayError(f"{path}: plage de tirs sur {count} pas (attendu 1)")
+                (shot_count,) = SHOT_COUNT.unpack_from(data, offset)
+                offset += SHOT_COUNT.size
+                shots = tuple(SHOT.unpack_from(data, offset + i * SHOT.size) for i in range(shot_count))
+                offset += shot_count * SHOT.size
+            inputs = Inputs(bool(bits & KEY_LEFT), bool(bits & KEY_RIGHT),
+                            bool(bits & KEY_JUMP), bool(bits & KEY_DASH), shots)
+            runs.append((inputs, count))
+        expected = FOOTER.unpack_from(data, offset)
+    except struct.error:
+        raise ReplayError(f"{path}: fichier tronqué")
+    return {
+        "seed": seed,
+        "level_idx": level_idx,
+        "view_size": (view_w, view_h),
+        "runs": runs,
+        "expected": expected,
+    }
+
+
+def run_replay(replay, levels=None):
+    """Rejoue un enregistrement chargé; renvoie (monde, état final, durée)."""
+    world = World(levels, view_size=replay["view_size"], seed=replay["seed"])
+    world.start(replay["level_idx"])
+    step = world.step
+    ticks = 0
+    started = time.perf_counter()
+    for inputs, count in replay["runs"]:
+        for _ in range(count):
+            step(inputs, FIXED_DT)
+        ticks += count
+    elapsed = time.perf_counter() - started
+    return world, _end_state(world, ticks), elapsed
+
+
+def main(argv):
+    if len(argv) != 2:
+        print("usage: python replay.py partie.rep")
+        return 2
+    try:
+        replay = load_replay(argv[1])
+    except (OSError, ReplayError) as exc:
+        print(exc)
+        return 2
+    world, state, elapsed = run_replay(replay)
+    ticks = state[0]
+    rate = ticks / elapsed if elapsed > 0 else float("inf")
+    print(f"{ticks} pas ({ticks * FIXED_DT:.1f} s de jeu) en {elapsed:.3f} s, {rate:.0f} pas/s")
+    if state != replay["expected"]:
+        labels = ("pas", "score", "vies", "niveau", "x", "y")
+        for label, got, want in zip(labels, state, replay["expected"]):
+            if got != want:
+                print(f"DIVERGENCE {label}: obtenu {got}, attendu {want}")
+        return 1
+    print(f"OK score={world.score} vies={world.lives} niveau={world.level_idx} "
+          f"joueur=({world.player_pos.x:.1f}, {world.player_pos.y:.1f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))